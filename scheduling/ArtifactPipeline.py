@@ -0,0 +1,260 @@
+from dataclasses import dataclass
+from queue import Queue
+from threading import Thread
+
+import pandas as pd
+import structlog
+
+logger = structlog.getLogger(__name__)
+
+
+@dataclass
+class ParticleSummary:
+    """The results of the evaluation of a Particle during an epoch."""
+
+    epoch: int  #: The epoch identifier.
+    particle: int  #: The Particle identifier.
+    stats: list  #: The SchedulerStats of the experiments of the Particle.
+    is_best: bool  #: A flag telling whether the Particle is the best of the epoch.
+
+    @property
+    def cost(self):
+        """float: The mean cost of the experiments of the Particle."""
+        return sum(stat.cost for stat in self.stats) / len(self.stats)
+
+
+@dataclass
+class SamplingPolicy:
+    """The Particles whose artifacts are produced."""
+
+    every_n_epochs: int = 1  #: The period of the sampled epochs, the first included.
+    best_only: bool = False  #: A flag for only sampling the best Particle of an epoch.
+
+    def samples_epoch(self, epoch: int):
+        """Checks whether the Particles of an epoch may be sampled.
+
+        Args:
+            epoch: The epoch identifier.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        return epoch % self.every_n_epochs == 0
+
+    def samples(self, epoch: int, is_best: bool):
+        """Checks whether a Particle is sampled.
+
+        Args:
+            epoch: The epoch identifier.
+            is_best: A flag telling whether the Particle is the best of the epoch.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        return self.samples_epoch(epoch) and (is_best or not self.best_only)
+
+
+class ArtifactPipeline:
+    """A bounded queue of ParticleSummaries consumed by handlers in a worker thread.
+
+    It is a stat handler of Swarm.run_epochs: the Swarm hands over the summaries of
+    the sampled Particles and goes on with the training, while the handlers draw
+    and write the artifacts in the background. When the queue is full, the Swarm
+    waits for the worker, so that the pending stats do not pile up in memory.
+
+    A handler is a callable taking a ParticleSummary, it may define a close method
+    called once all the summaries are handled. An error raised by a handler stops
+    the pipeline and is raised again in the training thread.
+    """
+
+    def __init__(self, handlers: list, sampling=None, queue_size=8):
+        """Creates an ArtifactPipeline object.
+
+        Args:
+            handlers: The handlers of the summaries, called in order.
+            sampling: The SamplingPolicy of the Particles, defaults to all of them.
+            queue_size: The maximum number of summaries waiting for the worker.
+
+        """
+        self.handlers = handlers  #: The handlers of the summaries.
+        self.sampling = SamplingPolicy() if sampling is None else sampling
+        """SamplingPolicy: The Particles whose artifacts are produced."""
+        self.handled_count = 0  #: The number of summaries handled so far.
+        self._queue = Queue(queue_size)  #: The summaries waiting for the worker.
+        self._worker = None  #: The worker thread, started with the first summary.
+        self._error = None  #: The error raised by a handler.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def __call__(self, num_epoch: int, particle_idx: int, stats: list, is_best=False):
+        """Queues the summary of a Particle if it is sampled.
+
+        Args:
+            num_epoch: The epoch identifier.
+            particle_idx: The Particle identifier.
+            stats: The SchedulerStats of the experiments of the Particle.
+            is_best: A flag telling whether the Particle is the best of the epoch.
+
+        Raises:
+            Exception: The error raised by a handler.
+        """
+        self._raise_error()
+        if not self.sampling.samples(num_epoch, is_best):
+            return
+        if self._worker is None:
+            self._worker = Thread(target=self._work, name="artifacts", daemon=True)
+            self._worker.start()
+        self._queue.put(ParticleSummary(num_epoch, particle_idx, stats, is_best))
+
+    def samples_epoch(self, num_epoch: int):
+        """Checks whether the Particles of an epoch may be sampled, the \
+        experiments of the other epochs do not keep their completed jobs.
+
+        Args:
+            num_epoch: The epoch identifier.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        return self.sampling.samples_epoch(num_epoch)
+
+    def close(self):
+        """Waits for the queued summaries to be handled and closes the handlers.
+
+        Raises:
+            Exception: The error raised by a handler.
+        """
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+        self._raise_error()
+        for handler in self.handlers:
+            if hasattr(handler, "close"):
+                handler.close()
+
+    def _work(self):
+        while True:
+            summary = self._queue.get()
+            if summary is None:
+                return
+            if self._error is not None:
+                # The remaining summaries are dropped.
+                continue
+            try:
+                for handler in self.handlers:
+                    handler(summary)
+                self.handled_count += 1
+            except Exception as error:
+                logger.exception("Artifact handler failed.", epoch=summary.epoch)
+                self._error = error
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+class GanttHandler:
+    """Draws the schedules of the experiments of a Particle."""
+
+    def __init__(self, visualizer, directory: str):
+        """Creates a GanttHandler object.
+
+        Args:
+            visualizer: The visualizer object drawing the Gantt charts.
+            directory: The directory of the charts.
+
+        """
+        self.visualizer = visualizer  #: The visualizer drawing the Gantt charts.
+        self.directory = directory  #: The directory of the charts.
+
+    def __call__(self, summary: ParticleSummary):
+        futures = [
+            self.visualizer.draw_gantt(
+                stat,
+                f"{self.directory}/epoch_{summary.epoch}/"
+                f"particule-{summary.particle}-exp-{i}.png",
+            )
+            for i, stat in enumerate(summary.stats)
+        ]
+        # Waiting for the charts rendered in the background keeps the backpressure.
+        for future in futures:
+            if future is not None:
+                future.result()
+
+
+class CsvHandler:
+    """Writes the statistics of the experiments of a Particle to a CSV file."""
+
+    def __init__(self, visualizer, directory: str):
+        """Creates a CsvHandler object.
+
+        Args:
+            visualizer: The visualizer object writing the CSV files.
+            directory: The directory of the CSV files.
+
+        """
+        self.visualizer = visualizer  #: The visualizer writing the CSV files.
+        self.directory = directory  #: The directory of the CSV files.
+
+    def __call__(self, summary: ParticleSummary):
+        self.visualizer.to_csv(
+            [stat.to_dict() for stat in summary.stats],
+            f"{self.directory}/epoch_{summary.epoch}/"
+            f"particule-{summary.particle}.csv",
+        )
+
+
+class CostGraphHandler:
+    """Draws the costs of the sampled Particles against the epochs.
+
+    The graph is drawn again once the summaries of a new epoch arrive, and when the
+    pipeline is closed.
+    """
+
+    def __init__(self, visualizer, filepath: str):
+        """Creates a CostGraphHandler object.
+
+        Args:
+            visualizer: The visualizer object drawing the graph.
+            filepath: The location of the graph.
+
+        """
+        self.visualizer = visualizer  #: The visualizer drawing the graph.
+        self.filepath = filepath  #: The location of the graph.
+        self.costs = []  #: The epoch and cost of every sampled Particle.
+
+    def __call__(self, summary: ParticleSummary):
+        if self.costs and summary.epoch != self.costs[-1][0]:
+            self.close()
+        self.costs.append((summary.epoch, summary.cost))
+
+    def close(self):
+        """Draws the graph of the costs received so far."""
+        if not self.costs:
+            return
+        df_cost = pd.DataFrame(self.costs, columns=["epoch", "cost"])
+        df_cost = df_cost.groupby("epoch")["cost"].agg(["mean", "min", "max"])
+        self.visualizer.draw_graph(df_cost.reset_index(), self.filepath, True)
+
+
+def log_summary(summary: ParticleSummary):
+    """Logs the statistics of the experiments of a Particle.
+
+    Args:
+        summary: The ParticleSummary to be logged.
+    """
+    df_stat = pd.DataFrame([stat.to_dict() for stat in summary.stats])
+    logger.debug(f"\n{df_stat}", epoch=summary.epoch, particule_idx=summary.particle)
+    logger.debug(
+        "Mean cost",
+        cost=df_stat["cost"].mean(),
+        epoch=summary.epoch,
+        particule_idx=summary.particle + 1,
+    )
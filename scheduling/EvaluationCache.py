@@ -0,0 +1,191 @@
+import pickle
+import sqlite3
+import threading
+import time
+from dataclasses import replace
+from hashlib import sha256
+from pathlib import Path
+
+import structlog
+
+from .Scheduler import SchedulerConfig
+from .WorkloadCache import WorkloadCache, sources_digest
+
+logger = structlog.getLogger(__name__)
+
+
+class EvaluationCache:
+    """A persistent cache of the statistics of experiments.
+
+    The statistics are keyed by the configuration of the Scheduler, rounded to a
+    number of significant digits so that close configurations share their
+    evaluations, the flags of the Scheduler, the server count, the seed and the job
+    count. They are stored in an SQLite database, which the worker processes open
+    concurrently, and the least recently used ones are evicted beyond the capacity.
+    The keys also hold a digest of the sources of the simulation, so that the
+    evaluations of a previous version of the code are never looked up again.
+    """
+
+    SOURCES = (
+        "Experiments.py",
+        "Job.py",
+        "JobRegistry.py",
+        "JobRequest.py",
+        "RequestQueue.py",
+        "Scheduler.py",
+        "Server.py",
+        "Simulation.py",
+        "Workload.py",
+    )  #: The modules the statistics of the experiments depend on.
+    VERSION = sources_digest(SOURCES)
+    """The version of the simulation, a digest of SOURCES part of the keys of the \
+    cache."""
+    EVICTION_PERIOD = 256  #: The number of insertions between two evictions.
+
+    def __init__(self, path=None, capacity=100000, precision=4):
+        """Creates an EvaluationCache object.
+
+        Args:
+            path: The SQLite database file. If None, the evaluations are only \
+            cached in memory, by every process and thread separately.
+            capacity: The maximum number of evaluations kept, it is enforced \
+            every EVICTION_PERIOD insertions.
+            precision: The number of significant digits of the configuration \
+            parameters in the keys.
+        """
+        self.path = None if path is None else Path(path)
+        """pathlib.Path: The SQLite database file."""
+        self.capacity = capacity  #: The maximum number of evaluations kept.
+        self.precision = precision
+        """The number of significant digits of the parameters in the keys."""
+        self.hits = 0  #: The number of evaluations found in the cache.
+        self.misses = 0  #: The number of evaluations that had to be simulated.
+        self._insertions = 0  #: The number of insertions since the last eviction.
+        self._local = threading.local()  #: The connection of every thread.
+
+    def __getstate__(self):
+        # The connections are opened again by every process.
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def key(
+        self,
+        config: SchedulerConfig,
+        flags: tuple,
+        server_count: int,
+        seed_num: int,
+        job_count: int,
+    ):
+        """Computes the key of an experiment.
+
+        Args:
+            config: The configuration of the Scheduler.
+            flags: The reconfiguration, power-off and decision making flags.
+            server_count: The total number of servers.
+            seed_num: The seed of the experiment.
+            job_count: The number of jobs of the workload.
+
+        Returns:
+            str: A hexadecimal digest identifying the experiment.
+        """
+        params = [float(f"{value:.{self.precision}g}") for value in config.to_list()]
+        content = repr(
+            (
+                EvaluationCache.VERSION,
+                WorkloadCache.VERSION,
+                params,
+                tuple(bool(flag) for flag in flags),
+                server_count,
+                seed_num,
+                job_count,
+            )
+        )
+        return sha256(content.encode()).hexdigest()[:32]
+
+    def get(self, key: str):
+        """Looks an experiment up.
+
+        Args:
+            key: The key of the experiment.
+
+        Returns:
+            SchedulerStats: The statistics of the experiment, None if not cached.
+        """
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT stats FROM evaluations WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        connection.execute(
+            "UPDATE evaluations SET used_at = ? WHERE key = ?", (time.time(), key)
+        )
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key: str, stats):
+        """Stores the statistics of an experiment.
+
+        Their PhaseMetrics are not stored, a cache hit does not run the scheduler.
+
+        Args:
+            key: The key of the experiment.
+            stats: The SchedulerStats of the experiment.
+        """
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?)",
+            (
+                key,
+                pickle.dumps(replace(stats, metrics=None), pickle.HIGHEST_PROTOCOL),
+                time.time(),
+            ),
+        )
+        self._insertions += 1
+        if self._insertions >= EvaluationCache.EVICTION_PERIOD:
+            self._evict()
+
+    def __len__(self):
+        query = "SELECT COUNT(*) FROM evaluations"
+        return self._connection().execute(query).fetchone()[0]
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            database = ":memory:"
+            if self.path is not None:
+                self.path.parent.mkdir(0o755, parents=True, exist_ok=True)
+                database = str(self.path)
+            # Autocommit, every statement is a transaction of its own.
+            connection = sqlite3.connect(database, timeout=60, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations "
+                "(key TEXT PRIMARY KEY, stats BLOB NOT NULL, used_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS evaluations_used_at "
+                "ON evaluations (used_at)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def _evict(self):
+        self._insertions = 0
+        deleted = (
+            self._connection()
+            .execute(
+                "DELETE FROM evaluations WHERE key IN (SELECT key FROM evaluations "
+                "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.capacity,),
+            )
+            .rowcount
+        )
+        if deleted:
+            logger.debug("Evicted evaluations.", count=deleted)
@@ -0,0 +1,83 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+
+
+class ExecutorMode(str, Enum):
+    """The ways of running independent tasks."""
+
+    SERIAL = "serial"  #: The tasks run one after another in the calling thread.
+    THREAD = "thread"  #: The tasks run in a pool of threads.
+    PROCESS = "process"  #: The tasks run in a pool of processes.
+
+
+class SerialExecutor:
+    """An executor running the tasks one after another in the calling thread.
+
+    It offers the submit and map interface of the concurrent.futures executors so
+    that the serial and the parallel runs share the same code.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        """Runs a function immediately.
+
+        Args:
+            fn: The function to be run.
+            *args: The positional arguments passed to fn.
+            **kwargs: The named arguments passed to fn.
+
+        Returns:
+            concurrent.futures.Future: A completed future holding the result.
+        """
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        """Applies a function to the items of iterables, lazily and in order.
+
+        Args:
+            fn: The function to be applied.
+            *iterables: The iterables whose items are passed to fn.
+            timeout: Ignored, for compatibility with concurrent.futures.
+            chunksize: Ignored, for compatibility with concurrent.futures.
+
+        Returns:
+            iterator: The results of fn, in the order of the items.
+        """
+        return map(fn, *iterables)
+
+    def shutdown(self, wait=True):
+        """Releases the resources of the executor, there are none."""
+
+
+def make_executor(mode="serial", num_workers=None):
+    """Creates an executor for running independent tasks.
+
+    All the executors offer submit(fn, *args) and an order-preserving
+    map(fn, *iterables, chunksize=1), a chunksize above 1 sends the tasks to the
+    processes in batches.
+
+    Args:
+        mode: An ExecutorMode or its value.
+        num_workers: The number of threads or processes, defaults to the \
+        number of processors.
+
+    Returns:
+        An executor, to be used as a context manager.
+    """
+    mode = ExecutorMode(mode)
+    if mode is ExecutorMode.THREAD:
+        return ThreadPoolExecutor(num_workers)
+    if mode is ExecutorMode.PROCESS:
+        return ProcessPoolExecutor(num_workers)
+    return SerialExecutor()
@@ -1,11 +1,11 @@
-from math import ceil, log, sqrt
-from random import randrange, seed, uniform
+from functools import partial
+from pathlib import Path
 
-import numpy
-import scipy.stats
-
-from .JobRequest import JobRequest
+from .Executor import SerialExecutor
+from .JobLog import JobLog
 from .Scheduler import Scheduler, SchedulerConfig
+from .Simulation import Simulation
+from .Workload import Workload
 
 
 class Experiments:
@@ -13,9 +13,19 @@ class Experiments:
     """
 
     GENERATED_JOBS_COUNT = 50  #: Number of jobs to generate.
+    TIME_STEP = 10  #: The resolution of the simulated clock in seconds.
 
     def __init__(
-        self, reconfig_enabled=True, power_off_enabled=True, param_enabled=True,
+        self,
+        reconfig_enabled=True,
+        power_off_enabled=True,
+        param_enabled=True,
+        keep_history=True,
+        workload_cache=None,
+        evaluation_cache=None,
+        job_count=GENERATED_JOBS_COUNT,
+        history_dir=None,
+        instrument=False,
     ):
         """Constructs an Experiments object.
 
@@ -23,14 +33,45 @@ class Experiments:
             reconfig_enabled: A flag for enabling reconfigurations.
             power_off_enabled: A flag for enabling power-offs.
             param_enabled: A flag for enabling the decision making process.
+            keep_history: A flag for keeping the completed jobs in the statistics.
+            workload_cache: A WorkloadCache the workloads are loaded from. If \
+            None, the workloads are generated for every experiment.
+            evaluation_cache: An EvaluationCache the statistics of the \
+            experiments are looked up in when the completed jobs are not kept.
+            job_count: The number of jobs of the workload of every experiment.
+            history_dir: A directory the kept completed jobs of every \
+            experiment are streamed to, in a JobLog of their own in the \
+            subdirectory seed_{seed_num}. A re-run experiment overwrites its \
+            JobLog. If None, they are kept in memory.
+            instrument: A flag for attaching the PhaseMetrics of the \
+            Schedulers to the statistics, PhaseMetrics.aggregate sums them.
         """
         self.reconfig_enabled = reconfig_enabled
         """A flag for enabling reconfigurations."""
         self.power_off_enabled = power_off_enabled  #: A flag for enabling power-offs.
         self.param_enabled = param_enabled  #: A flag for enabling power-offs.
+        self.keep_history = keep_history
+        """A flag for keeping the completed jobs in the statistics."""
+        self.workload_cache = workload_cache
+        """WorkloadCache: The cache the workloads are loaded from."""
+        self.evaluation_cache = evaluation_cache
+        """EvaluationCache: The cache of the statistics of the experiments."""
+        self.job_count = job_count
+        """The number of jobs of the workload of every experiment."""
+        self.history_dir = history_dir
+        """The directory the completed jobs are streamed to."""
+        self.instrument = instrument
+        """A flag for timing the phases of the Schedulers."""
 
     def run_expts(
-        self, config: SchedulerConfig, num_srvs: int, num_expts: int, seed_num: int
+        self,
+        config: SchedulerConfig,
+        num_srvs: int,
+        num_expts: int,
+        seed_num: int,
+        executor=None,
+        chunksize=1,
+        history_dir=None,
     ):
         """Runs a number of experiments with the specified configuration.
 
@@ -39,17 +80,49 @@ class Experiments:
             num_srvs: The total number of servers.
             num_expts: The number of experiements to be run.
             seed_num: A seed used to update the job generator.
+            executor: An executor from make_executor running the experiments. \
+            If None, they run serially.
+            chunksize: The number of experiments sent at once to a worker process.
+            history_dir: The directory the kept completed jobs are streamed to \
+            instead of the history_dir of the Experiments, so that the callers \
+            lay out the JobLogs of their experiments.
 
         Returns:
-            list: A list of scheduling statistics.
+            list: A list of scheduling statistics, in seed order.
         """
-        stats = []
-        for i in range(num_expts):
-            expt_stats = self._run_expt(config, num_srvs, seed_num + i)
-            stats.append(expt_stats)
-        return stats
+        if executor is None:
+            executor = SerialExecutor()
+        seeds = range(seed_num, seed_num + num_expts)
+        run_expt = partial(self._run_expt, config, num_srvs, history_dir=history_dir)
+        return list(executor.map(run_expt, seeds, chunksize=chunksize))
+
+    def run_workload(
+        self, config: SchedulerConfig, num_srvs: int, job_requests, seed_num=0
+    ):
+        """Runs one experiment on a given workload, a trace for instance.
+
+        The JobRequests are consumed lazily, and the statistics are not cached.
+
+        Args:
+            config: The configuration the Scheduler within the experiment.
+            num_srvs: The total number of servers.
+            job_requests: An iterable of JobRequest objects ordered by \
+            submission time.
+            seed_num: The seed of the Scheduler.
 
-    def _run_expt(self, config: SchedulerConfig, num_srvs: int, seed_num: int):
+        Returns:
+            SchedulerStats: The statistics of the experiment.
+        """
+        scheduler = self._make_scheduler(config, num_srvs, seed_num)
+        simulation = Simulation(scheduler, time_step=Experiments.TIME_STEP)
+        end_time = simulation.run(job_requests)
+
+        scheduler.stop(end_time)
+        return scheduler.stats(stretch_time_weight=1, energy_weight=1)
+
+    def _run_expt(
+        self, config: SchedulerConfig, num_srvs: int, seed_num: int, history_dir=None
+    ):
         """Runs one experiment.
 
         Args:
@@ -57,6 +130,8 @@ class Experiments:
             num_srvs: The total number of servers.
             num_expts: The number of experiements to be run.
             seed_num: A seed used to update the job generator.
+            history_dir: The directory the kept completed jobs are streamed to, \
+            if not the history_dir of the Experiments.
 
         Returns:
             SchedulerStats: A SchedulerStats object wrapping the statistics of\
@@ -64,28 +139,57 @@ class Experiments:
             By default the weights of the reconfigurations and power-offs in the\
             in the resulting objects are 1.
         """
-        scheduler = Scheduler(
+        # The cached statistics do not hold the completed jobs.
+        cache = None if self.keep_history else self.evaluation_cache
+        if cache is not None:
+            key = self._cache_key(config, num_srvs, seed_num)
+            stats = cache.get(key)
+            if stats is not None:
+                return stats
+
+        scheduler = self._make_scheduler(config, num_srvs, seed_num, history_dir)
+        workload = self._generate_workload(self.job_count, num_srvs, seed_num)
+
+        simulation = Simulation(scheduler, time_step=Experiments.TIME_STEP)
+        end_time = simulation.run(workload.requests())
+
+        scheduler.stop(end_time)
+        stats = scheduler.stats(stretch_time_weight=1, energy_weight=1)
+        if cache is not None:
+            cache.put(key, stats)
+        return stats
+
+    def _make_scheduler(
+        self, config: SchedulerConfig, num_srvs: int, seed_num: int, history_dir=None
+    ):
+        if history_dir is None:
+            history_dir = self.history_dir
+        job_sink = None
+        if self.keep_history and history_dir is not None:
+            # The JobLog truncates the files of a previous run of the experiment.
+            job_sink = JobLog(Path(history_dir) / f"seed_{seed_num}")
+        return Scheduler(
             num_srvs,
             config,
             self.reconfig_enabled,
             self.power_off_enabled,
             self.param_enabled,
+            keep_history=self.keep_history,
+            seed_num=seed_num,
+            job_sink=job_sink,
+            instrument=self.instrument,
         )
 
-        jobs = self._generate_jobs(Experiments.GENERATED_JOBS_COUNT, num_srvs, seed_num)
-
-        time = 0
-        while jobs or scheduler.is_working():
-            for job in list(jobs):
-                if time < job.sub_time:
-                    break
-                scheduler.schedule(job)
-                jobs.remove(job)
-            scheduler.update_schedule(time)
-            time += 10
-
-        scheduler.stop(time)
-        return scheduler.stats(stretch_time_weight=1, energy_weight=1)
+    def _cache_key(self, config: SchedulerConfig, num_srvs: int, seed_num: int):
+        if self.evaluation_cache is None:
+            return None
+        return self.evaluation_cache.key(
+            config,
+            (self.reconfig_enabled, self.power_off_enabled, self.param_enabled),
+            num_srvs,
+            seed_num,
+            self.job_count,
+        )
 
     def _generate_jobs(self, job_count, server_count, seed_num):
         """Generates a set of jobs.
@@ -98,50 +202,20 @@ class Experiments:
         Returns:
             list: A list of generated JobRequest objects.
         """
-        jobs = []
-        previous_sub_time = 0
-        for i in range(job_count):
-            job = self._generate_job(previous_sub_time, server_count, i, seed_num)
-            jobs.append(job)
-            previous_sub_time = job.sub_time
-        return jobs
+        workload = self._generate_workload(job_count, server_count, seed_num)
+        return list(workload.requests())
 
-    def _generate_job(self, timestampLastEvent, server_count, num, seed_num):
-        """Generates one job.
+    def _generate_workload(self, job_count, server_count, seed_num):
+        """Generates a Google-like workload.
 
         Args:
-            timestampLastEvent: The time of the last event.
+            job_count: The number of jobs to be generates.
             server_count: The total number of servers.
-            num: An index of the job, used to update the job generator.
             seed_num: A seed used to update the job generator.
 
         Returns:
-            list: A list of generated jobs
+            Workload: The generated Workload.
         """
-        seed(seed_num + num)
-        numpy.random.seed(seed=seed_num + num)
-        sub_time, mass = self._get_next_task(timestampLastEvent, 500, 1700, 3.8)
-        alpha = uniform(0.5, 1)
-        data = uniform(10, 500)
-        min_num_servers = ceil((alpha / 3) * (server_count - 1))
-        max_num_servers = randrange(min_num_servers, server_count)
-        return JobRequest(
-            "job" + str(num),
-            sub_time,
-            alpha,
-            data,
-            mass,
-            min_num_servers,
-            max_num_servers,
-        )
-
-    def _get_next_task(self, timestampLastEvent, dynamism, mass, disparity):
-        arrival = scipy.stats.pareto.rvs(4, loc=-1) * 3 * dynamism
-        newTimeStamp = timestampLastEvent + arrival
-        makespan = self._get_makespan(mass, disparity)
-        return (newTimeStamp, makespan)
-
-    def _get_makespan(self, mass, disparity):
-        mu = log(mass / disparity)
-        sigma = sqrt(2 * (numpy.log(mass) - mu))
-        return scipy.stats.lognorm.rvs(sigma, scale=mass / disparity)
+        if self.workload_cache is not None:
+            return self.workload_cache.get(job_count, server_count, seed_num)
+        return Workload.generate(job_count, server_count, seed_num)
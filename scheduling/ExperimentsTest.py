@@ -1,19 +1,30 @@
 import logging
 from pathlib import Path
+from random import Random
 
 import pandas
 
+from .Executor import make_executor
 from .Experiments import Experiments
 from .Scheduler import SchedulerConfig
+from .TaskGraph import TaskGraph
 
 logger = logging.getLogger(__name__)
 
+CONFIG_PATH = "./config.yml"  #: The configuration the benchmark results depend on.
+SOURCE_PATHS = sorted(str(path) for path in Path(__file__).parent.glob("*.py"))
+"""The sources of the package the benchmark results depend on."""
+
 # Test file for running the 6 Benchmarking setups in the report.
 
 
+def best_config_path(seed):
+    return f"./results/swarm_training/seed_{seed}/swarm_best_config.csv"
+
+
 def load_best_config(seed, path=None):
     if path is None:
-        path = f"./results/swarm_training/seed_{seed}/swarm_best_config.csv"
+        path = best_config_path(seed)
     if not Path(path).exists():
         logger.debug("Specified best config does not exist. Loading default config.")
         return SchedulerConfig()
@@ -23,82 +34,196 @@ def load_best_config(seed, path=None):
     return best_config
 
 
-def run_all_experiments(visualizer, config):
-    seed = config["SEED"]
-    output_dir = f"./results/benchmarking_experiments/seed_{seed}"
+def run_experiments(
+    config,
+    scheduler_config,
+    flags,
+    first_expt,
+    expt_count,
+    workload_cache=None,
+    evaluation_cache=None,
+    history_dir=None,
+):
+    """Runs a chunk of the experiments of one benchmarking setup.
+
+    Args:
+        config: The loaded configuration of the benchmarks.
+        scheduler_config: The configuration of the scheduler.
+        flags: The flags passed to the Experiments object.
+        first_expt: The index of the first experiment of the chunk.
+        expt_count: The number of experiments of the chunk.
+        workload_cache: The WorkloadCache shared by the experiments.
+        evaluation_cache: The EvaluationCache shared by the experiments.
+        history_dir: The directory the completed jobs of the setup are \
+        streamed to. If None, they are kept in memory.
+
+    Returns:
+        list: A list of scheduling statistics, in experiment order.
+    """
+    experiment = Experiments(
+        keep_history=config["draw_experiment_gantt"],
+        workload_cache=workload_cache,
+        evaluation_cache=evaluation_cache,
+        history_dir=history_dir,
+        **flags,
+    )
+    return experiment.run_expts(
+        config=scheduler_config,
+        num_srvs=config["SERVER_COUNT"],
+        num_expts=expt_count,
+        seed_num=config["SEED"] + first_expt,
+    )
 
-    def run_experiments(expt_name, scheduler_config, **kwargs):
-        experiment = Experiments(**kwargs)
-        stats = experiment.run_expts(
-            config=scheduler_config,
-            num_srvs=config["SERVER_COUNT"],
-            num_expts=config["EXPTS_COUNT"],
-            seed_num=config["SEED"],
-        )
 
-        if config["draw_experiment_gantt"]:
-            for i, stat in enumerate(stats):
-                visualizer.draw_gantt(
-                    stat, f"{output_dir}/{expt_name}/experiment_{i}.png"
+def draw_gantts(visualizer, output_dir, first_expt, stats):
+    futures = [
+        visualizer.draw_gantt(stat, f"{output_dir}/experiment_{first_expt + i}.png")
+        for i, stat in enumerate(stats)
+    ]
+    # The task is only complete once its charts are written.
+    for future in futures:
+        if future is not None:
+            future.result()
+
+
+def draw_cost(visualizer, filepath, *chunks):
+    df_stats = pandas.DataFrame([stat.to_dict() for stats in chunks for stat in stats])
+    visualizer.draw_graph(df_stats, filepath)
+
+
+def write_csv(visualizer, filepath, *chunks):
+    visualizer.to_csv([stat.to_dict() for stats in chunks for stat in stats], filepath)
+
+
+def benchmark_setups(seed):
+    """Lists the six benchmarking setups of the report.
+
+    Args:
+        seed: The seed of the random configurations, and of the swarm training \
+        whose best configuration is used.
+
+    Returns:
+        list: The name, the scheduler configuration and the Experiments flags \
+        of each setup.
+    """
+    # The random configurations are drawn in order, the same for every run.
+    rng = Random(seed)
+    return [
+        # Reconfigurations and Power-offs take place whenever possible.---------
+        (
+            "fifo",
+            SchedulerConfig(),
+            dict(reconfig_enabled=False, power_off_enabled=False, param_enabled=False),
+        ),
+        (
+            "fifo_reconfig",
+            SchedulerConfig(),
+            dict(reconfig_enabled=True, power_off_enabled=False, param_enabled=False),
+        ),
+        (
+            "fifo_poweroff",
+            SchedulerConfig(),
+            dict(reconfig_enabled=False, power_off_enabled=True, param_enabled=False),
+        ),
+        (
+            "fifo_reconfig_poweroff",
+            SchedulerConfig.random(rng),
+            dict(reconfig_enabled=True, power_off_enabled=True, param_enabled=False),
+        ),
+        # Reconfigurations and Power-offs take place after a decision is taken.
+        (
+            "random_params",
+            SchedulerConfig.random(rng),
+            dict(reconfig_enabled=True, power_off_enabled=True, param_enabled=True),
+        ),
+        (
+            "swarm_param",
+            load_best_config(seed),
+            dict(reconfig_enabled=True, power_off_enabled=True, param_enabled=True),
+        ),
+    ]
+
+
+def run_all_experiments(visualizer, config, workload_cache=None, evaluation_cache=None):
+    """Runs the six benchmarking setups concurrently.
+
+    The experiments of each setup are split into chunks of CHUNK_SIZE experiments,
+    each simulated by a task followed by the task of its Gantt charts. The cost
+    graph and the CSV file of the setup wait for all its chunks. The tasks whose
+    outputs are newer than the configuration and the sources of the package are
+    skipped.
+
+    Args:
+        visualizer: The visualizer object for drawing graphs and charts.
+        config: The loaded configuration of the benchmarks.
+        workload_cache: The WorkloadCache shared by the experiments.
+        evaluation_cache: The EvaluationCache shared by the experiments.
+    """
+    seed = config["SEED"]
+    output_dir = f"./results/benchmarking_experiments/seed_{seed}"
+    inputs = [CONFIG_PATH] + SOURCE_PATHS
+    expt_count = config["EXPTS_COUNT"]
+    chunk_size = config.get("CHUNK_SIZE") or expt_count
+
+    graph = TaskGraph()
+    for expt_name, scheduler_config, flags in benchmark_setups(seed):
+        expt_dir = f"{output_dir}/{expt_name}"
+        expt_inputs = inputs
+        if expt_name == "swarm_param":
+            expt_inputs = inputs + [best_config_path(seed)]
+        history_dir = None
+        if config.get("HISTORY_DIR") is not None:
+            history_dir = f"{config['HISTORY_DIR']}/{expt_name}"
+
+        simulations = []
+        for first_expt in range(0, expt_count, chunk_size):
+            chunk_count = min(chunk_size, expt_count - first_expt)
+            simulation = graph.add(
+                f"{expt_name}:simulation:{first_expt}",
+                run_experiments,
+                args=(
+                    config,
+                    scheduler_config,
+                    flags,
+                    first_expt,
+                    chunk_count,
+                    workload_cache,
+                    evaluation_cache,
+                    history_dir,
+                ),
+            )
+            simulations.append(simulation)
+            if config["draw_experiment_gantt"]:
+                graph.add(
+                    f"{expt_name}:gantt:{first_expt}",
+                    draw_gantts,
+                    args=(visualizer, expt_dir, first_expt),
+                    deps=[simulation],
+                    outputs=[
+                        f"{expt_dir}/experiment_{i}.png"
+                        for i in range(first_expt, first_expt + chunk_count)
+                    ],
+                    inputs=expt_inputs,
                 )
         if config["draw_experiment_cost"]:
-            df_stats = pandas.DataFrame([stat.to_dict() for stat in stats])
-            visualizer.draw_graph(
-                df_stats, f"{output_dir}/{expt_name}/{expt_name}_cost.png"
+            graph.add(
+                f"{expt_name}:cost",
+                draw_cost,
+                args=(visualizer, f"{expt_dir}/{expt_name}_cost.png"),
+                deps=simulations,
+                outputs=[f"{expt_dir}/{expt_name}_cost.png"],
+                inputs=expt_inputs,
             )
-
-        visualizer.to_csv(
-            [stat.to_dict() for stat in stats],
-            f"{output_dir}/{expt_name}/{expt_name}.csv",
+        graph.add(
+            f"{expt_name}:csv",
+            write_csv,
+            args=(visualizer, f"{expt_dir}/{expt_name}.csv"),
+            deps=simulations,
+            outputs=[f"{expt_dir}/{expt_name}.csv"],
+            inputs=expt_inputs,
         )
-        logger.debug("Done.")
-
-    # Reconfigurations and Power-offs take place whenever possible.-------------
-    run_experiments(
-        "fifo",
-        SchedulerConfig(),
-        reconfig_enabled=False,
-        power_off_enabled=False,
-        param_enabled=False,
-    )
-
-    run_experiments(
-        "fifo_reconfig",
-        SchedulerConfig(),
-        reconfig_enabled=True,
-        power_off_enabled=False,
-        param_enabled=False,
-    )
-
-    run_experiments(
-        "fifo_poweroff",
-        SchedulerConfig(),
-        reconfig_enabled=False,
-        power_off_enabled=True,
-        param_enabled=False,
-    )
 
-    run_experiments(
-        "fifo_reconfig_poweroff",
-        SchedulerConfig.random(),
-        reconfig_enabled=True,
-        power_off_enabled=True,
-        param_enabled=False,
-    )
-
-    # Reconfigurations and Power-offs take place after a decision is taken possible.
-    run_experiments(
-        "random_params",
-        SchedulerConfig.random(),
-        reconfig_enabled=True,
-        power_off_enabled=True,
-        param_enabled=True,
-    )
-
-    run_experiments(
-        "swarm_param",
-        load_best_config(seed),
-        reconfig_enabled=True,
-        power_off_enabled=True,
-        param_enabled=True,
-    )
+    with make_executor(
+        config.get("EXECUTOR", "serial"), config.get("WORKER_COUNT")
+    ) as executor:
+        graph.run(executor)
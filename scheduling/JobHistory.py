@@ -0,0 +1,161 @@
+from array import array
+from collections import namedtuple
+from enum import IntEnum
+
+import numpy as np
+
+from .Job import Job
+
+JobRecord = namedtuple(
+    "JobRecord", ["id", "kind", "start_time", "end_time", "servers"]
+)  #: A completed Job as stored in a JobHistory, servers are server indexes.
+
+
+class JobHistory:
+    """A compact, append-only store of completed Jobs.
+
+    The Jobs are stored as columns of packed arrays rather than as objects. The
+    indexes of the servers of all the Jobs are packed in a single array, the
+    servers of the i-th Job being server_ids[server_offsets[i]:server_offsets[i+1]].
+    A Job takes about 30 bytes plus 4 bytes per server.
+    """
+
+    class Kind(IntEnum):
+        """The kinds of Jobs stored in a JobHistory."""
+
+        JOB = 0  #: A Job performing calculations.
+        RECONFIGURATION = 1  #: A reconfiguration of a Job.
+        POWER_OFF = 2  #: A Power-off Job.
+
+        @classmethod
+        def of(cls, job: Job):
+            """Gives the kind of a Job.
+
+            Args:
+                job: The Job whose kind is checked.
+
+            Returns:
+                JobHistory.Kind: The kind of the Job.
+            """
+            if job.is_power_off():
+                return cls.POWER_OFF
+            if job.is_reconfiguration():
+                return cls.RECONFIGURATION
+            return cls.JOB
+
+    def __init__(self):
+        """Creates an empty JobHistory object."""
+        self.ids = []  #: The distinct JobRequest identifiers, in order of appearance.
+        self._id_index = {}  #: The position of each identifier in ids.
+        self.job_ids = array("i")  #: The position in ids of the id of each Job.
+        self.kinds = array("b")  #: The JobHistory.Kind of each Job.
+        self.start_times = array("d")  #: The starting time of each Job.
+        self.end_times = array("d")  #: The ending time of each Job.
+        self.server_offsets = array("q", [0])
+        """The offsets in server_ids of the servers of each Job."""
+        self.server_ids = array("i")  #: The packed server indexes of all the Jobs.
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return (self.record(i) for i in range(len(self)))
+
+    def __repr__(self):
+        return f"JobHistory({len(self)} jobs, {len(self.ids)} ids)"
+
+    def append(self, job: Job):
+        """Stores a completed Job.
+
+        Args:
+            job: The completed Job object.
+        """
+        id_index = self._id_index.get(job.id)
+        if id_index is None:
+            id_index = self._id_index[job.id] = len(self.ids)
+            self.ids.append(job.id)
+        self.job_ids.append(id_index)
+        self.kinds.append(JobHistory.Kind.of(job))
+        self.start_times.append(job.start_time)
+        self.end_times.append(job.end_time)
+        self.server_ids.extend(server.index for server in job.servers)
+        self.server_offsets.append(len(self.server_ids))
+
+    def servers(self, i: int):
+        """Gives the indexes of the servers of a Job.
+
+        Args:
+            i: The position of the Job in the history.
+
+        Returns:
+            array: The indexes of the servers the Job ran on.
+        """
+        return self.server_ids[self.server_offsets[i] : self.server_offsets[i + 1]]
+
+    def record(self, i: int):
+        """Gives a stored Job.
+
+        Args:
+            i: The position of the Job in the history.
+
+        Returns:
+            JobRecord: The Job at position i.
+        """
+        return JobRecord(
+            self.ids[self.job_ids[i]],
+            JobHistory.Kind(self.kinds[i]),
+            self.start_times[i],
+            self.end_times[i],
+            self.servers(i),
+        )
+
+    def by_id(self):
+        """Groups the stored Jobs by JobRequest identifier.
+
+        Returns:
+            dict: The JobRecords of each identifier, in completion order.
+        """
+        jobs_by_id = {job_id: [] for job_id in self.ids}
+        for job in self:
+            jobs_by_id[job.id].append(job)
+        return jobs_by_id
+
+    def columns(self):
+        """Gives the columns of the history as NumPy arrays, without copying them.
+
+        The history cannot grow while the returned arrays are alive.
+
+        Returns:
+            dict: The job_ids, kinds, start_times, end_times, server_offsets and\
+            server_ids columns.
+        """
+        return {
+            name: np.frombuffer(column, dtype=column.typecode)
+            for name, column in (
+                ("job_ids", self.job_ids),
+                ("kinds", self.kinds),
+                ("start_times", self.start_times),
+                ("end_times", self.end_times),
+                ("server_offsets", self.server_offsets),
+                ("server_ids", self.server_ids),
+            )
+        }
+
+    def server_runs(self):
+        """Splits the servers of every Job into runs of consecutive indexes.
+
+        A run is drawn as one rectangle by the Gantt charts and the schedule viewer.
+
+        Returns:
+            tuple: The position of the Job, the first server and the server count \
+            of every run, as NumPy arrays ordered by Job then by first server.
+        """
+        columns = self.columns()
+        server_ids = columns["server_ids"]
+        server_counts = np.diff(columns["server_offsets"])
+        owners = np.repeat(np.arange(len(server_counts)), server_counts)
+        servers = server_ids[np.lexsort((server_ids, owners))]
+        is_first = np.ones(len(servers), dtype=bool)
+        is_first[1:] = (owners[1:] != owners[:-1]) | (np.diff(servers) != 1)
+        firsts = np.flatnonzero(is_first)
+        return owners[firsts], servers[firsts], np.diff(np.append(firsts, len(servers)))
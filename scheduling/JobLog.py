@@ -0,0 +1,162 @@
+import os
+from array import array
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .Job import Job
+from .JobHistory import JobHistory
+
+
+class JobLog:
+    """An append-only log of completed Jobs streamed to binary files.
+
+    The Jobs are buffered in columns and appended in batches to one raw file per
+    column in a directory, so that the memory of the scheduler does not grow with
+    the number of completed Jobs. The log is read back as a MappedJobHistory,
+    whose columns are memory-mapped from the files.
+
+    The columns are the ones of JobHistory: kinds (int8), start_times and end_times
+    (float64), server_offsets (int64, starting with 0) and server_ids (int32). The
+    JobRequest identifiers are written one per line in ids.txt.
+    """
+
+    BATCH_SIZE = 4096  #: The number of Jobs buffered before being written.
+    COLUMNS = {
+        "kinds": "b",
+        "start_times": "d",
+        "end_times": "d",
+        "server_offsets": "q",
+        "server_ids": "i",
+    }  #: The array typecodes of the columns.
+
+    def __init__(self, directory, batch_size=BATCH_SIZE):
+        """Creates an empty JobLog object, truncating the files of the directory.
+
+        Args:
+            directory: The directory of the column files, created if needed.
+            batch_size: The number of Jobs buffered before being written.
+
+        """
+        self.directory = Path(directory)  #: pathlib.Path: The directory of the log.
+        self.batch_size = batch_size
+        """The number of Jobs buffered before being written."""
+        self.count = 0  #: The number of Jobs written to the files.
+        self._server_count = 0  #: The number of server indexes written.
+        self._buffer = {name: array(code) for name, code in JobLog.COLUMNS.items()}
+        self._ids = []  #: The buffered JobRequest identifiers.
+
+        self.directory.mkdir(0o755, parents=True, exist_ok=True)
+        for name in JobLog.COLUMNS:
+            self._path(name).write_bytes(b"")
+        self._path("server_offsets").write_bytes(array("q", [0]).tobytes())
+        self._ids_path.write_text("")
+
+    def __len__(self):
+        return self.count + len(self._ids)
+
+    def __repr__(self):
+        return f"JobLog({str(self.directory)!r}, {len(self)} jobs)"
+
+    def append(self, job: Job):
+        """Stores a completed Job, writing the buffer once it is full.
+
+        Args:
+            job: The completed Job object.
+        """
+        buffer = self._buffer
+        self._ids.append(job.id)
+        buffer["kinds"].append(JobHistory.Kind.of(job))
+        buffer["start_times"].append(job.start_time)
+        buffer["end_times"].append(job.end_time)
+        buffer["server_ids"].extend(server.index for server in job.servers)
+        buffer["server_offsets"].append(
+            self._server_count + len(buffer["server_ids"])
+        )
+        if len(self._ids) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered Jobs to the files."""
+        if not self._ids:
+            return
+        for name, column in self._buffer.items():
+            with open(self._path(name), "ab") as file:
+                column.tofile(file)
+        with open(self._ids_path, "a") as file:
+            file.write("\n".join(self._ids) + "\n")
+        self.count += len(self._ids)
+        self._server_count += len(self._buffer["server_ids"])
+        self._buffer = {name: array(code) for name, code in JobLog.COLUMNS.items()}
+        self._ids = []
+
+    def read(self):
+        """Reads the log back, after writing the buffered Jobs.
+
+        Returns:
+            MappedJobHistory: The stored Jobs.
+        """
+        self.flush()
+        return MappedJobHistory(self.directory)
+
+    def _path(self, name):
+        return self.directory / f"{name}.bin"
+
+    @property
+    def _ids_path(self):
+        return self.directory / "ids.txt"
+
+
+class MappedJobHistory(JobHistory):
+    """A read-only JobHistory memory-mapped from the files of a JobLog."""
+
+    def __init__(self, directory):
+        """Opens the files of a JobLog.
+
+        Args:
+            directory: The directory of the JobLog.
+
+        """
+        directory = Path(directory)
+        self.directory = directory  #: pathlib.Path: The directory of the log.
+        for name, code in JobLog.COLUMNS.items():
+            path = directory / f"{name}.bin"
+            dtype = np.dtype(code)
+            # Empty files cannot be memory-mapped.
+            if os.path.getsize(path):
+                column = np.memmap(path, dtype=dtype, mode="r")
+            else:
+                column = np.empty(0, dtype=dtype)
+            setattr(self, name, column)
+
+        with open(directory / "ids.txt") as file:
+            ids = file.read().splitlines()
+        job_ids, unique_ids = pd.factorize(pd.Series(ids, dtype=object), sort=False)
+        self.job_ids = job_ids.astype(np.int32)
+        """numpy.ndarray: The position in ids of the id of each Job."""
+        self.ids = list(unique_ids)
+        """The distinct JobRequest identifiers, in order of appearance."""
+        self._id_index = None
+
+    def __repr__(self):
+        return f"MappedJobHistory({str(self.directory)!r}, {len(self)} jobs)"
+
+    def append(self, job: Job):
+        raise TypeError("A MappedJobHistory is read-only, append to its JobLog")
+
+    def columns(self):
+        """Gives the columns of the history as NumPy arrays, without copying them.
+
+        Returns:
+            dict: The job_ids, kinds, start_times, end_times, server_offsets and\
+            server_ids columns.
+        """
+        return {
+            "job_ids": self.job_ids,
+            "kinds": self.kinds,
+            "start_times": self.start_times,
+            "end_times": self.end_times,
+            "server_offsets": self.server_offsets,
+            "server_ids": self.server_ids,
+        }
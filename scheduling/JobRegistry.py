@@ -0,0 +1,96 @@
+from heapq import heapify, heappop, heappush
+from itertools import count
+
+from .Job import Job
+
+
+class JobRegistry:
+    """A registry of the active Jobs of a scheduler indexed by their ending time.
+
+    The Jobs are kept in insertion order for iteration and, in parallel, in a binary
+    heap ordered by ending time. Removing a Job is O(1): its heap entry is only
+    discarded once it reaches the top of the heap, or when the stale entries
+    outnumber the active Jobs.
+    """
+
+    def __init__(self):
+        """Creates an empty JobRegistry object."""
+        self._jobs = {}  #: The active Jobs in insertion order.
+        self._heap = []  #: A heap of (end_time, tie breaker, Job) entries.
+        self._counter = count()  #: A tie breaker keeping the heap stable.
+        self.power_off_count = 0  #: The number of active Power-off Jobs.
+        self._reconfigurable = {}  #: The reconfigurable Jobs in insertion order.
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __iter__(self):
+        return iter(self._jobs)
+
+    def __contains__(self, job):
+        return job in self._jobs
+
+    def __repr__(self):
+        return repr(list(self._jobs))
+
+    def add(self, job: Job):
+        """Registers an active Job.
+
+        Args:
+            job: The Job object to be registered.
+        """
+        self._jobs[job] = None
+        heappush(self._heap, (job.end_time, next(self._counter), job))
+        if job.is_power_off():
+            self.power_off_count += 1
+        elif job.is_reconfigurable():
+            self._reconfigurable[job] = None
+
+    def remove(self, job: Job):
+        """Unregisters a Job.
+
+        Args:
+            job: The Job object to be unregistered.
+        """
+        del self._jobs[job]
+        if job.is_power_off():
+            self.power_off_count -= 1
+        else:
+            self._reconfigurable.pop(job, None)
+        if len(self._heap) > 2 * len(self._jobs) + 64:
+            self._compact()
+
+    def reconfigurable(self):
+        """Gives the registered Jobs that could run on more servers.
+
+        Returns:
+            iterator: The reconfigurable Jobs, in insertion order.
+        """
+        return iter(self._reconfigurable)
+
+    def pop_complete(self, time):
+        """Gives the registered Jobs that are complete at a time t.
+
+        The cost is proportional to the number of complete Jobs. The returned \
+        Jobs are expected to be removed from the registry by the caller.
+
+        Args:
+            time: The instant at which the Jobs are checked.
+
+        Returns:
+            list: The complete Jobs ordered by ending time.
+        """
+        complete_jobs = []
+        while self._heap and self._heap[0][0] <= time:
+            end_time, _, job = heappop(self._heap)
+            if job in self._jobs and job.end_time == end_time:
+                complete_jobs.append(job)
+        return complete_jobs
+
+    def _compact(self):
+        self._heap = [
+            entry
+            for entry in self._heap
+            if entry[2] in self._jobs and entry[2].end_time == entry[0]
+        ]
+        heapify(self._heap)
@@ -1,87 +1,38 @@
-from math import inf
-from random import random
-
-import numpy as np
-
-from .Scheduler import SchedulerConfig
+from .Population import Population
 
 
 class Particle:
     """A representative class of a member of the Swarm.
+
+    It is a view on one row of the Population of the Swarm.
     """
 
-    def __init__(self, config: SchedulerConfig):
+    def __init__(self, population: Population, index: int):
         """Constructs a Particle objects
 
         Args:
-            config: The scheduler configuration the Particle \
-            would use for scheduling jobs.
+            population: The Population holding the state of the Particle.
+            index: The row of the Particle in the Population.
         """
+        self.population = population  #: The Population holding the Particle.
+        self.index = index  #: The row of the Particle in the Population.
 
-        self.config = config
+    @property
+    def config(self):
         """SchedulerConfig: The configuration within the Particle."""
-        self.best_config = config
-        """SchedulerConfig: The best configuration within the Particle."""
-        self.best_cost = inf
-        """float: The best cost the Particle calculated."""
-        self.velocity = np.zeros(len(config.to_list()))
-        """numpy.array: The velocity vector of the Particle."""
-        self.c1 = 2
-        """A scaling factor for the relative position of the Particle in respect\
-         to its best known position."""
-        self.c2 = 2
-        """A scaling factor for the relative position of the Particle in respect\
-         to the group's best known position."""
-        self.update_rate = 0.1  #: The updating rate
-
-    def update_position(self, group_best_config: SchedulerConfig):
-        """Updates the position of the Particle.
+        return self.population.config(self.index)
 
-        Args:
-            group_best_config (SchedulerConfig): The Swarm best known configuration.
-        """
-        position = np.array(self.config.to_list())
-        best_pos = np.array(self.best_config.to_list())
-        group_best_pos = np.array(group_best_config.to_list())
-
-        self.velocity = self.update_rate * (
-            self.velocity
-            + self.c1 * random() * (best_pos - position)
-            + self.c2 * random() * (group_best_pos - position)
-        )
-        position = self.velocity + position
-        self.config = SchedulerConfig(*position)
-        self.config = self._check_bounds(self.config)
-
-    def update_cost(self, cost: float):
-        """Updates the best cost of the Particle.
-
-        Args:
-            cost: The calculated cost to compare to the Particle's best cost.
-        """
-        if cost < self.best_cost:
-            self.best_cost = cost
-            self.best_config = self.config
+    @property
+    def best_config(self):
+        """SchedulerConfig: The best configuration within the Particle."""
+        return self.population.best_config(self.index)
 
-    def _check_bounds(self, config):
-        # Handles boundaries checks through the reflection method
-        config.shutdown_scale = self._reflect(config.shutdown_scale, 0, 1)
-        config.shutdown_weight = self._reflect(config.shutdown_weight, 0, 1)
-        config.reconfig_scale = self._reflect(config.reconfig_scale, 0, 1)
-        config.reconfig_weight = self._reflect(config.reconfig_weight, 0, 1)
-        config.shutdown_time_short = self._reflect(
-            config.shutdown_time_short, 260, 100000
-        )
-        config.shutdown_time_long = self._reflect(
-            config.shutdown_time_long, 260, 100000
-        )
-        config.shutdown_time_prob = self._reflect(config.shutdown_time_prob, 0, 1)
-        config.alpha_weight = self._reflect(config.alpha_weight, 0, 1)
-        return config
+    @property
+    def best_cost(self):
+        """float: The best cost the Particle calculated."""
+        return float(self.population.best_costs[self.index])
 
-    def _reflect(self, variable, lowerbound, upperbound):
-        if variable > upperbound:
-            return upperbound - (variable - upperbound)
-        if variable < lowerbound:
-            return lowerbound + (lowerbound - variable)
-        return variable
+    @property
+    def velocity(self):
+        """numpy.array: The velocity vector of the Particle."""
+        return self.population.velocities[self.index]
@@ -0,0 +1,436 @@
+import gc
+import json
+import os
+import platform
+import statistics
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable
+
+import structlog
+
+from .Experiments import Experiments
+from .Population import Population
+from .Scheduler import Scheduler, SchedulerConfig
+from .Simulation import Simulation
+from .Visualizer import Visualizer
+from .Workload import Workload
+
+logger = structlog.getLogger(__name__)
+
+HISTORY_VERSION = 1  #: The version of the layout of the history file.
+
+
+@dataclass
+class SuiteSettings:
+    """The size of the experiments measured by the benchmarks."""
+
+    server_count: int = 100  #: The total number of servers.
+    job_count: int = 1000  #: The number of jobs of the workloads.
+    particle_count: int = 64  #: The number of Particles of the Population.
+    seed: int = 1  #: The seed of the workloads and of the random decisions.
+    repeat: int = 5  #: The number of timed runs of every benchmark.
+    warmup: int = 1  #: The number of untimed runs preceding them.
+
+
+@dataclass
+class Benchmark:
+    """A measured operation of the simulator.
+
+    Every run calls setup, which is not timed, and then times number calls of the
+    operation it returns.
+    """
+
+    name: str  #: The name of the benchmark, the measured method.
+    kind: str  #: micro for a hot path, macro for a whole experiment.
+    setup: Callable  #: Prepares a run from the SuiteSettings, returns the operation.
+    number: int = 1  #: The number of calls of the operation per run.
+
+
+@dataclass
+class BenchmarkResult:
+    """The timings of a benchmark, in seconds per call of its operation."""
+
+    name: str  #: The name of the benchmark.
+    kind: str  #: micro or macro.
+    repeat: int  #: The number of timed runs.
+    number: int  #: The number of calls of the operation per run.
+    min: float  #: The fastest run.
+    median: float  #: The median run.
+    mean: float  #: The mean run.
+    stdev: float  #: The standard deviation of the runs.
+
+    def to_dict(self):
+        """Converts a BenchmarkResult object into a dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class Comparison:
+    """The change of the time of a benchmark between two runs of the suite."""
+
+    name: str  #: The name of the benchmark.
+    baseline: float  #: The fastest time of the baseline run.
+    current: float  #: The fastest time of the current run.
+    change: float  #: The relative change, positive when slower.
+    regressed: bool  #: A flag telling whether the change exceeds the threshold.
+
+    def to_dict(self):
+        """Converts a Comparison object into a dictionary."""
+        return asdict(self)
+
+
+def _make_scheduler(settings: SuiteSettings, keep_history=False):
+    return Scheduler(
+        settings.server_count,
+        SchedulerConfig(),
+        keep_history=keep_history,
+        seed_num=settings.seed,
+    )
+
+
+def _workload(settings: SuiteSettings):
+    return Workload.generate(settings.job_count, settings.server_count, settings.seed)
+
+
+def _simulate(settings: SuiteSettings, keep_history=False):
+    scheduler = _make_scheduler(settings, keep_history)
+    simulation = Simulation(scheduler, time_step=Experiments.TIME_STEP)
+    scheduler.stop(simulation.run(_workload(settings).requests()))
+    return scheduler
+
+
+class _RecordingScheduler(Scheduler):
+    # Records the times and the submissions of the updates of a simulation.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.steps = []
+        self._submitted = 0
+
+    def schedule(self, job_request):
+        super().schedule(job_request)
+        self._submitted += 1
+
+    def update_schedule(self, time):
+        self.steps.append((time, self._submitted))
+        super().update_schedule(time)
+
+
+def setup_schedule(settings: SuiteSettings):
+    """Prepares the submission of a whole workload to an idle Scheduler."""
+    scheduler = _make_scheduler(settings)
+    job_requests = list(_workload(settings).requests())
+
+    def run():
+        for job_request in job_requests:
+            scheduler.schedule(job_request)
+
+    return run
+
+
+def setup_update_schedule(settings: SuiteSettings):
+    """Prepares the replay of the updates of the schedule of a simulation.
+
+    The times of the updates and the submissions preceding them are recorded from
+    a first simulation, so that the replay does not time the event queue.
+    """
+    recorder = _RecordingScheduler(
+        settings.server_count, SchedulerConfig(), seed_num=settings.seed
+    )
+    Simulation(recorder, time_step=Experiments.TIME_STEP).run(
+        _workload(settings).requests()
+    )
+    scheduler = _make_scheduler(settings)
+    job_requests = list(_workload(settings).requests())
+
+    def run():
+        submitted = 0
+        for time, submission_count in recorder.steps:
+            for job_request in job_requests[submitted:submission_count]:
+                scheduler.schedule(job_request)
+            submitted = submission_count
+            scheduler.update_schedule(time)
+
+    return run
+
+
+def setup_stats(settings: SuiteSettings):
+    """Prepares the statistics of a simulated Scheduler."""
+    scheduler = _simulate(settings)
+    return lambda: scheduler.stats(stretch_time_weight=1, energy_weight=1)
+
+
+def setup_generate_jobs(settings: SuiteSettings):
+    """Prepares the generation of the JobRequests of a workload."""
+    experiment = Experiments()
+    return lambda: experiment._generate_jobs(
+        settings.job_count, settings.server_count, settings.seed
+    )
+
+
+def setup_update_positions(settings: SuiteSettings):
+    """Prepares a move of the Particles of a random Population."""
+    rng = Random(settings.seed)
+    population = Population.random(settings.particle_count, rng)
+    return lambda: population.update_positions(0, rng)
+
+
+def setup_run_expt(settings: SuiteSettings):
+    """Prepares a whole experiment, without its completed jobs."""
+    experiment = Experiments(keep_history=False, job_count=settings.job_count)
+    return lambda: experiment._run_expt(
+        SchedulerConfig(), settings.server_count, settings.seed
+    )
+
+
+def setup_draw_gantt(settings: SuiteSettings, directory: str):
+    """Prepares the Gantt chart of a simulated Scheduler."""
+    stats = _simulate(settings, keep_history=True).stats(1, 1)
+    visualizer = Visualizer()
+    return lambda: visualizer.draw_gantt(stats, f"{directory}/gantt.png")
+
+
+def benchmarks(directory: str):
+    """Gives the benchmarks of the suite.
+
+    Args:
+        directory: The directory of the files written by the benchmarks.
+
+    Returns:
+        list: A list of Benchmark objects.
+    """
+    return [
+        Benchmark("Scheduler.schedule", "micro", setup_schedule),
+        Benchmark("Scheduler.update_schedule", "micro", setup_update_schedule),
+        Benchmark("Scheduler.stats", "micro", setup_stats, number=100),
+        Benchmark("Experiments._generate_jobs", "micro", setup_generate_jobs),
+        Benchmark(
+            "Population.update_positions", "micro", setup_update_positions, number=100
+        ),
+        Benchmark("Experiments._run_expt", "macro", setup_run_expt),
+        Benchmark(
+            "Visualizer.draw_gantt",
+            "macro",
+            lambda settings: setup_draw_gantt(settings, directory),
+        ),
+    ]
+
+
+def run_benchmark(benchmark: Benchmark, settings: SuiteSettings):
+    """Times the runs of a benchmark.
+
+    As in timeit, the garbage collector is disabled while timing.
+
+    Args:
+        benchmark: The Benchmark to be run.
+        settings: The SuiteSettings of the runs.
+
+    Returns:
+        BenchmarkResult: The timings of the runs.
+    """
+    times = []
+    for i in range(settings.warmup + settings.repeat):
+        operation = benchmark.setup(settings)
+        gc.collect()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = perf_counter()
+            for _ in range(benchmark.number):
+                operation()
+            elapsed = perf_counter() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if i >= settings.warmup:
+            times.append(elapsed / benchmark.number)
+
+    return BenchmarkResult(
+        benchmark.name,
+        benchmark.kind,
+        settings.repeat,
+        benchmark.number,
+        min(times),
+        statistics.median(times),
+        statistics.mean(times),
+        statistics.stdev(times) if len(times) > 1 else 0.0,
+    )
+
+
+def run_suite(settings: SuiteSettings, kinds=("micro", "macro"), names=None):
+    """Runs the benchmarks of the suite.
+
+    Args:
+        settings: The SuiteSettings of the runs.
+        kinds: The kinds of the benchmarks to be run.
+        names: The names of the benchmarks to be run. If None, all of them.
+
+    Returns:
+        dict: The run of the suite, with its date, platform, settings and results.
+    """
+    results = []
+    with TemporaryDirectory() as directory:
+        for benchmark in benchmarks(directory):
+            if benchmark.kind not in kinds:
+                continue
+            if names is not None and benchmark.name not in names:
+                continue
+            result = run_benchmark(benchmark, settings)
+            logger.info("benchmark", **result.to_dict())
+            results.append(result)
+
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor_count": os.cpu_count(),
+        "settings": asdict(settings),
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def load_history(path):
+    """Loads the runs of the suite stored in a history file.
+
+    Args:
+        path: The JSON history file.
+
+    Returns:
+        list: The stored runs, oldest first, empty if the file does not exist.
+
+    Raises:
+        ValueError: If the file was written with another layout.
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path) as file:
+        history = json.load(file)
+    if history["version"] != HISTORY_VERSION:
+        raise ValueError(f"Unsupported history version {history['version']}")
+    return history["runs"]
+
+
+def append_history(path, run: dict):
+    """Appends a run of the suite to a history file, replaced atomically.
+
+    Args:
+        path: The JSON history file, created if needed.
+        run: The run given by run_suite.
+    """
+    runs = load_history(path) + [run]
+    path = Path(path)
+    path.parent.mkdir(0o755, parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as file:
+        json.dump({"version": HISTORY_VERSION, "runs": runs}, file, indent=1)
+    os.replace(tmp_path, path)
+
+
+def compare_runs(baseline: dict, current: dict, threshold=0.1):
+    """Compares the times of the benchmarks of two runs of the suite.
+
+    The fastest runs are compared, the slower ones mostly measure the noise of the
+    machine. Only the benchmarks of both runs are compared.
+
+    Args:
+        baseline: The reference run.
+        current: The compared run.
+        threshold: The relative slowdown beyond which a benchmark regressed.
+
+    Returns:
+        list: A list of Comparison objects, in the order of the current run.
+    """
+    if baseline["settings"] != current["settings"]:
+        logger.warning(
+            "The compared runs have different settings.",
+            baseline=baseline["settings"],
+            current=current["settings"],
+        )
+    baseline_times = {result["name"]: result["min"] for result in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        name = result["name"]
+        if name not in baseline_times:
+            continue
+        change = result["min"] / baseline_times[name] - 1
+        comparisons.append(
+            Comparison(
+                name, baseline_times[name], result["min"], change, change > threshold
+            )
+        )
+    return comparisons
+
+
+def report_comparisons(comparisons: list):
+    """Logs the comparisons of two runs of the suite.
+
+    Args:
+        comparisons: The Comparison objects given by compare_runs.
+
+    Returns:
+        list: The names of the regressed benchmarks.
+    """
+    for comparison in comparisons:
+        log = logger.warning if comparison.regressed else logger.info
+        log(
+            "regression" if comparison.regressed else "comparison",
+            **comparison.to_dict(),
+        )
+    return [comparison.name for comparison in comparisons if comparison.regressed]
+
+
+def run_perf_suite(config: dict):
+    """Runs the suite, stores the run in the history and compares it to the \
+    previous one.
+
+    Args:
+        config: The loaded configuration of the suite.
+
+    Returns:
+        list: The names of the regressed benchmarks.
+    """
+    settings = SuiteSettings(
+        server_count=config.get("SERVER_COUNT", 100),
+        job_count=config.get("JOB_COUNT", 1000),
+        particle_count=config.get("PARTICLE_COUNT", 64),
+        seed=config.get("SEED", 1),
+        repeat=config.get("REPEAT", 5),
+        warmup=config.get("WARMUP", 1),
+    )
+    history_path = config.get("HISTORY", "./results/perf/history.json")
+    previous_runs = load_history(history_path)
+    run = run_suite(settings, config.get("KINDS", ("micro", "macro")))
+    append_history(history_path, run)
+    if not previous_runs:
+        return []
+    return report_comparisons(
+        compare_runs(previous_runs[-1], run, config.get("THRESHOLD", 0.1))
+    )
+
+
+def compare_perf_history(config: dict):
+    """Compares the last run of the history to a baseline run.
+
+    Args:
+        config: The loaded configuration of the suite. Its BASELINE is the \
+        position of the baseline run in the history, the previous run by default.
+
+    Returns:
+        list: The names of the regressed benchmarks.
+
+    Raises:
+        ValueError: If the history holds less than two runs.
+    """
+    runs = load_history(config.get("HISTORY", "./results/perf/history.json"))
+    if len(runs) < 2:
+        raise ValueError("Comparing needs at least two runs in the history")
+    return report_comparisons(
+        compare_runs(
+            runs[config.get("BASELINE", -2)], runs[-1], config.get("THRESHOLD", 0.1)
+        )
+    )
@@ -0,0 +1,82 @@
+import json
+from dataclasses import asdict, astuple, dataclass, fields
+
+
+@dataclass
+class PhaseMetrics:
+    """The timers and decision counters of the phases of the updates of a Scheduler.
+
+    The times are measured with the monotonic clock of time.perf_counter, in
+    seconds. The metrics of several Schedulers add up, for instance over the
+    experiments of Experiments.run_expts or the Particles of a Swarm epoch.
+    """
+
+    update_count: int = 0  #: The number of updates of the schedule.
+    retire_time: float = 0.0  #: The time spent retiring the completed jobs.
+    schedule_time: float = 0.0  #: The time spent in the FIFO allocation.
+    reconfigure_time: float = 0.0  #: The time spent reconfiguring jobs.
+    power_off_time: float = 0.0  #: The time spent powering off servers.
+    jobs_retired: int = 0  #: The number of completed jobs, power-offs included.
+    jobs_started: int = 0  #: The number of jobs started from the queue.
+    reconfigs_considered: int = 0  #: The number of reconfiguration decisions.
+    reconfigs_accepted: int = 0  #: The number of reconfigurations started.
+    shutdowns_considered: int = 0  #: The number of power-off decisions.
+    shutdowns_accepted: int = 0  #: The number of power-offs started.
+
+    def __add__(self, other):
+        return PhaseMetrics(*(a + b for a, b in zip(astuple(self), astuple(other))))
+
+    @property
+    def total_time(self):
+        """float: The time spent in all the phases."""
+        return (
+            self.retire_time
+            + self.schedule_time
+            + self.reconfigure_time
+            + self.power_off_time
+        )
+
+    @classmethod
+    def aggregate(cls, stats):
+        """Sums the metrics of experiments.
+
+        Args:
+            stats: An iterable of SchedulerStats objects. The ones without \
+            metrics, from Schedulers that were not instrumented or from an \
+            EvaluationCache, are skipped.
+
+        Returns:
+            PhaseMetrics: The summed metrics.
+        """
+        total = cls()
+        for stat in stats:
+            if stat.metrics is not None:
+                total += stat.metrics
+        return total
+
+    @classmethod
+    def from_dict(cls, values: dict):
+        """Creates a PhaseMetrics object from the dictionary of to_dict.
+
+        Args:
+            values: The dictionary of the metrics.
+
+        Returns:
+            PhaseMetrics: The metrics.
+        """
+        return cls(**{field.name: values[field.name] for field in fields(cls)})
+
+    def to_dict(self):
+        """Converts a PhaseMetrics object into a dictionary, with the total time."""
+        return {**asdict(self), "total_time": self.total_time}
+
+    def to_json(self, indent=None):
+        """Converts a PhaseMetrics object into a JSON document.
+
+        Args:
+            indent: The indentation of the document, as in json.dumps.
+
+        Returns:
+            str: The JSON document of to_dict.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
@@ -0,0 +1,141 @@
+from dataclasses import fields
+from math import inf
+
+import numpy as np
+
+from .Scheduler import SchedulerConfig
+
+
+class Population:
+    """The state of all the members of a Swarm, stored as matrices.
+
+    Row i of the matrices belongs to the i-th Particle and column j to the j-th
+    field of SchedulerConfig, so that the positions of the whole Swarm are
+    updated at once. SchedulerConfig objects are only built when a Scheduler
+    needs one.
+    """
+
+    BOUNDS = {
+        "reconfig_scale": (0, 1),
+        "reconfig_weight": (0, 1),
+        "alpha_weight": (0, 1),
+        "shutdown_scale": (0, 1),
+        "shutdown_weight": (0, 1),
+        "shutdown_time_short": (260, 100000),
+        "shutdown_time_long": (260, 100000),
+        "shutdown_time_prob": (0, 1),
+    }
+    """The bounds the positions are reflected on, by SchedulerConfig field."""
+
+    def __init__(self, positions):
+        """Creates a Population object.
+
+        Args:
+            positions: A (particles x fields) array of the initial positions.
+        """
+        self.positions = np.array(positions, dtype=float)
+        """numpy.array: The configurations of the Particles, one per row."""
+        self.velocities = np.zeros_like(self.positions)
+        """numpy.array: The velocity vectors of the Particles, one per row."""
+        self.best_positions = self.positions.copy()
+        """numpy.array: The best configurations of the Particles, one per row."""
+        self.best_costs = np.full(len(self.positions), inf)
+        """numpy.array: The best costs the Particles calculated."""
+        names = [field.name for field in fields(SchedulerConfig)]
+        self.lower_bounds = np.array([Population.BOUNDS[name][0] for name in names])
+        """numpy.array: The lower bound of every field."""
+        self.upper_bounds = np.array([Population.BOUNDS[name][1] for name in names])
+        """numpy.array: The upper bound of every field."""
+        self.c1 = 2
+        """A scaling factor for the relative position of the Particles in respect\
+         to their best known position."""
+        self.c2 = 2
+        """A scaling factor for the relative position of the Particles in respect\
+         to the group's best known position."""
+        self.update_rate = 0.1  #: The updating rate
+
+    @classmethod
+    def random(cls, size: int, rng=None):
+        """Creates a Population of random configurations.
+
+        Args:
+            size: The number of Particles.
+            rng: The random.Random generator to sample from, defaults to the \
+            global generator of the random module.
+
+        Returns:
+            Population: A Population object.
+        """
+        return cls([SchedulerConfig.random(rng).to_list() for _ in range(size)])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def config(self, i: int):
+        """Builds the configuration of a Particle.
+
+        Args:
+            i: The index of the Particle.
+
+        Returns:
+            SchedulerConfig: The current configuration of the Particle.
+        """
+        return SchedulerConfig(*self.positions[i].tolist())
+
+    def best_config(self, i: int):
+        """Builds the best configuration of a Particle.
+
+        Args:
+            i: The index of the Particle.
+
+        Returns:
+            SchedulerConfig: The best configuration of the Particle.
+        """
+        return SchedulerConfig(*self.best_positions[i].tolist())
+
+    def configs(self):
+        """Builds the configurations of all the Particles.
+
+        Returns:
+            list: A list of SchedulerConfig objects, in Particle order.
+        """
+        return [SchedulerConfig(*position) for position in self.positions.tolist()]
+
+    def update_costs(self, costs):
+        """Updates the best costs of the Particles.
+
+        Args:
+            costs: The calculated costs of the current positions, in Particle order.
+        """
+        costs = np.asarray(costs, dtype=float)
+        improved = costs < self.best_costs
+        self.best_costs[improved] = costs[improved]
+        self.best_positions[improved] = self.positions[improved]
+
+    def update_positions(self, group_best: int, rng):
+        """Moves all the Particles.
+
+        Args:
+            group_best: The index of the Particle with the Swarm best known \
+            configuration.
+            rng: The random.Random generator to sample from.
+        """
+        draws = np.array([rng.random() for _ in range(2 * len(self))])
+        draws = draws.reshape(-1, 2)
+        group_best_pos = self.positions[group_best].copy()
+
+        self.velocities = self.update_rate * (
+            self.velocities
+            + self.c1 * draws[:, :1] * (self.best_positions - self.positions)
+            + self.c2 * draws[:, 1:] * (group_best_pos - self.positions)
+        )
+        self.positions = self._reflect(self.velocities + self.positions)
+
+    def _reflect(self, positions):
+        # Handles boundaries checks through the reflection method
+        upper, lower = self.upper_bounds, self.lower_bounds
+        return np.where(
+            positions > upper,
+            2 * upper - positions,
+            np.where(positions < lower, 2 * lower - positions, positions),
+        )
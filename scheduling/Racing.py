@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from math import inf
+
+import numpy as np
+from scipy.stats import t as student_t
+
+
+@dataclass
+class RacingConfig:
+    """The settings of the racing evaluation of a Swarm."""
+
+    min_expts: int = 3
+    """The number of experiments every Particle runs before it can be dropped."""
+    alpha: float = 0.01  #: The significance level of the elimination test.
+
+
+class Race:
+    """A race between the Particles of a Swarm over common experiments.
+
+    The experiments are run in rounds, every Particle still in the race runs the
+    same experiment in a round. After min_expts rounds, the Particles whose costs
+    are significantly higher than the ones of the incumbent, the Particle with the
+    lowest mean cost, according to a one-sided paired t-test, are dropped.
+    """
+
+    def __init__(self, num_particles: int, num_expts: int, config: RacingConfig):
+        """Creates a Race object.
+
+        Args:
+            num_particles: The number of Particles in the race.
+            num_expts: The number of experiments of a Particle finishing the race.
+            config: The settings of the race.
+        """
+        assert config.min_expts > 1, "The paired test needs at least 2 experiments"
+        self.config = config  #: RacingConfig: The settings of the race.
+        self.costs = np.full((num_particles, num_expts), np.nan)
+        """numpy.array: The costs of the experiments, one row per Particle."""
+        self.alive = np.ones(num_particles, dtype=bool)
+        """numpy.array: The flags of the Particles still in the race."""
+        self.rounds = 0  #: The number of rounds run.
+
+    @property
+    def finished(self):
+        """bool: Whether all the rounds were run."""
+        return self.rounds == self.costs.shape[1]
+
+    def record(self, costs):
+        """Records the costs of a round, then drops the dominated Particles.
+
+        Args:
+            costs: The costs of the Particles still in the race, in Particle order.
+
+        Returns:
+            numpy.array: The indices of the Particles dropped in this round.
+        """
+        self.costs[self.alive, self.rounds] = costs
+        self.rounds += 1
+        if self.rounds < self.config.min_expts or self.finished:
+            return np.empty(0, dtype=int)
+
+        dropped = np.flatnonzero(self.alive)[self._dominated()]
+        self.alive[dropped] = False
+        return dropped
+
+    def estimated_costs(self):
+        """Estimates the mean cost of every Particle over all the experiments.
+
+        The costs of the experiments vary far more between workloads than between
+        Particles, so the partial means of the dropped Particles are not comparable
+        to the others. They are estimated as the mean cost of the best Particle
+        finishing the race plus their mean difference to it on the experiments
+        they ran.
+
+        Returns:
+            numpy.array: The estimated mean costs, in Particle order.
+        """
+        means = self.costs.mean(axis=1)
+        reference = np.flatnonzero(self.alive)[np.argmin(means[self.alive])]
+        diffs = np.nanmean(self.costs - self.costs[reference], axis=1)
+        return np.where(self.alive, means, means[reference] + diffs)
+
+    def _dominated(self):
+        costs = self.costs[self.alive, : self.rounds]
+        incumbent = np.argmin(costs.mean(axis=1))
+        diffs = costs - costs[incumbent]
+        mean = diffs.mean(axis=1)
+        std = diffs.std(axis=1, ddof=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_stat = mean / (std / np.sqrt(self.rounds))
+        # Identical differences on every experiment are either a sure loss or not.
+        t_stat = np.where(std > 0, t_stat, np.where(mean > 0, inf, -inf))
+        return student_t.sf(t_stat, self.rounds - 1) < self.config.alpha
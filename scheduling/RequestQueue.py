@@ -0,0 +1,75 @@
+from collections import deque
+from heapq import heappop, heappush, merge
+from itertools import count
+
+from .JobRequest import JobRequest
+
+
+class RequestQueue:
+    """A FIFO queue of JobRequests ordered by submission time.
+
+    JobRequests are mostly submitted in chronological order, they are then simply
+    appended to a deque. The few submitted out of order are kept in a binary heap.
+    The head of the queue is the earliest of the heads of both containers, requests
+    submitted at the same time are served in their submission order.
+    """
+
+    def __init__(self):
+        """Creates an empty RequestQueue object."""
+        self._ordered = deque()  #: The requests submitted in chronological order.
+        self._late = []  #: A heap of the requests submitted out of order.
+        self._counter = count()  #: A tie breaker keeping the queue FIFO.
+        self.required_servers = 0
+        """The sum of the minimum number of servers of all the queued requests."""
+
+    def __len__(self):
+        return len(self._ordered) + len(self._late)
+
+    def __iter__(self):
+        for _, _, job_request in merge(self._ordered, sorted(self._late)):
+            yield job_request
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def push(self, job_request: JobRequest):
+        """Adds a JobRequest to the queue.
+
+        Args:
+            job_request: The JobRequest object to be queued.
+        """
+        entry = (job_request.sub_time, next(self._counter), job_request)
+        if not self._ordered or self._ordered[-1][0] <= job_request.sub_time:
+            self._ordered.append(entry)
+        else:
+            heappush(self._late, entry)
+        self.required_servers += job_request.min_num_servers
+
+    def peek(self):
+        """Gives the JobRequest at the head of the queue without removing it.
+
+        Returns:
+            JobRequest: The earliest submitted JobRequest.
+        """
+        return self._head()[-1]
+
+    def pop(self):
+        """Removes the JobRequest at the head of the queue.
+
+        Returns:
+            JobRequest: The earliest submitted JobRequest.
+        """
+        head = self._head()
+        if self._ordered and head is self._ordered[0]:
+            job_request = self._ordered.popleft()[-1]
+        else:
+            job_request = heappop(self._late)[-1]
+        self.required_servers -= job_request.min_num_servers
+        return job_request
+
+    def _head(self):
+        if not self._late:
+            return self._ordered[0]
+        if not self._ordered:
+            return self._late[0]
+        return min(self._ordered[0], self._late[0], key=lambda entry: entry[:2])
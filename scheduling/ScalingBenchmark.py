@@ -0,0 +1,88 @@
+import resource
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from time import perf_counter
+
+import structlog
+
+from .Experiments import Experiments
+from .Scheduler import SchedulerConfig
+
+logger = structlog.getLogger(__name__)
+
+
+@dataclass
+class ScalingPoint:
+    """The measured cost of one experiment of the scaling benchmark."""
+
+    server_count: int  #: The total number of servers.
+    job_count: int  #: The number of jobs of the workload.
+    wall_time: float  #: The time taken by the experiment, in seconds.
+    peak_rss: float  #: The peak resident memory of the process, in MiB.
+    jobs_per_second: float  #: The number of jobs simulated per second.
+
+    def to_dict(self):
+        """Converts a ScalingPoint object into a dictionary."""
+        return asdict(self)
+
+
+def measure(server_count: int, job_count: int, seed_num: int, flags: dict):
+    """Runs one experiment and measures its cost.
+
+    It is meant to run in a fresh process, so that the peak memory is the one of
+    the experiment.
+
+    Args:
+        server_count: The total number of servers.
+        job_count: The number of jobs of the workload.
+        seed_num: The seed of the workload and of the scheduler.
+        flags: The flags passed to the Experiments object.
+
+    Returns:
+        ScalingPoint: The measured cost.
+    """
+    experiment = Experiments(keep_history=False, job_count=job_count, **flags)
+    start = perf_counter()
+    experiment.run_expts(SchedulerConfig(), server_count, 1, seed_num)
+    wall_time = perf_counter() - start
+    # ru_maxrss is in KiB on Linux.
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return ScalingPoint(
+        server_count, job_count, wall_time, peak_rss, job_count / wall_time
+    )
+
+
+def run_scaling_benchmark(visualizer, config: dict):
+    """Sweeps the server and job counts and reports the cost of the experiments.
+
+    Every point runs in a fresh process and the results are written to a CSV file.
+
+    Args:
+        visualizer: The visualizer object writing the CSV file.
+        config: The loaded configuration of the scaling benchmark.
+
+    Returns:
+        list: A list of ScalingPoint objects.
+    """
+    seed = config["SEED"]
+    flags = dict(
+        reconfig_enabled=config.get("reconfig_enabled", True),
+        power_off_enabled=config.get("power_off_enabled", True),
+        param_enabled=config.get("param_enabled", True),
+    )
+    points = []
+    for server_count in config["SERVER_COUNTS"]:
+        for job_count in config["JOB_COUNTS"]:
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                point = pool.submit(
+                    measure, server_count, job_count, seed, flags
+                ).result()
+            logger.info("scaling point", **point.to_dict())
+            points.append(point)
+
+    visualizer.to_csv(
+        [point.to_dict() for point in points],
+        f"./results/scaling/seed_{seed}/scaling.csv",
+    )
+    return points
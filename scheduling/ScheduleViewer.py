@@ -0,0 +1,194 @@
+import base64
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from .JobHistory import JobHistory
+from .JobLog import JobLog
+
+TEMPLATE_PATH = Path(__file__).with_suffix(".html")
+"""pathlib.Path: The HTML and JavaScript of the viewer."""
+
+
+def export_schedule(
+    history,
+    filepath: str,
+    server_count=None,
+    time_buckets=8192,
+    max_rows=256,
+    tile_size=65536,
+):
+    """Writes a self-contained HTML viewer of a schedule.
+
+    The page needs no server, the schedule is embedded in it as compressed binary
+    blobs. The occupancy of the servers is aggregated per row of servers and per
+    time bucket into a pyramid of resolutions, each level halving the number of
+    buckets of the previous one, which the viewer draws when zoomed out. The job
+    rectangles, sorted by starting time, are split into tiles that the viewer only
+    decompresses when a few of them are in view.
+
+    Args:
+        history: The JobHistory or JobLog of the completed jobs.
+        filepath: The location of the HTML file, its directories are created.
+        server_count: The total number of servers. If None, the servers up to \
+        the last one used by a job are shown.
+        time_buckets: The number of time buckets of the finest level.
+        max_rows: The maximum number of rows of servers of the occupancy, the \
+        servers are grouped beyond it.
+        tile_size: The number of job rectangles per tile.
+    """
+    if isinstance(history, JobLog):
+        history = history.read()
+    columns = history.columns()
+    rectangles = _rectangles(history, columns)
+    if server_count is None:
+        server_count = int(np.max(columns["server_ids"], initial=0)) + 1
+    time_min = float(rectangles["start"].min()) if len(rectangles) else 0.0
+    time_max = float(rectangles["end"].max()) if len(rectangles) else 1.0
+    time_max = max(time_max, time_min + 1)
+
+    group_size = -(-server_count // max_rows)
+    busy, off = _occupancy(
+        rectangles, time_min, time_max, time_buckets, server_count, group_size
+    )
+
+    blobs = {}
+    levels = []
+    while True:
+        name = f"level{len(levels)}"
+        blobs[name] = _quantize(busy).tobytes() + _quantize(off).tobytes()
+        levels.append({"blob": name, "buckets": busy.shape[1]})
+        if busy.shape[1] <= 1:
+            break
+        busy, off = _halve(busy), _halve(off)
+
+    tiles = []
+    for start in range(0, len(rectangles), tile_size):
+        tile = rectangles[start : start + tile_size]
+        name = f"tile{len(tiles)}"
+        time_origin = float(tile["start"][0])
+        blobs[name] = b"".join(
+            [
+                (tile["start"] - time_origin).astype(np.float32).tobytes(),
+                (tile["end"] - tile["start"]).astype(np.float32).tobytes(),
+                tile["first_server"].astype(np.uint32).tobytes(),
+                tile["server_count"].astype(np.uint32).tobytes(),
+                tile["job_id"].astype(np.uint32).tobytes(),
+                tile["kind"].astype(np.uint8).tobytes(),
+            ]
+        )
+        tiles.append(
+            {
+                "blob": name,
+                "count": len(tile),
+                "time_origin": time_origin,
+                "end": float(tile["end"].max()),
+            }
+        )
+    blobs["ids"] = "\n".join(history.ids).encode()
+
+    meta = {
+        "server_count": server_count,
+        "time_min": time_min,
+        "time_max": time_max,
+        "group_size": group_size,
+        "row_count": busy.shape[0],
+        "levels": levels,
+        "tiles": tiles,
+        "kinds": {kind.name: int(kind) for kind in JobHistory.Kind},
+    }
+    data = "\n".join(
+        f'<script type="application/octet-stream" id="{name}">'
+        f"{base64.b64encode(zlib.compress(blob)).decode()}</script>"
+        for name, blob in blobs.items()
+    )
+    page = (
+        TEMPLATE_PATH.read_text()
+        .replace("/*META*/", json.dumps(meta))
+        .replace("<!--DATA-->", data)
+    )
+    path = Path(filepath)
+    path.parent.mkdir(0o755, parents=True, exist_ok=True)
+    path.write_text(page)
+
+
+def _rectangles(history, columns: dict):
+    # The runs of consecutive servers of every job, sorted by starting time.
+    jobs, first_servers, server_counts = history.server_runs()
+    rectangles = np.empty(
+        len(jobs),
+        dtype=[
+            ("start", "f8"),
+            ("end", "f8"),
+            ("first_server", "i8"),
+            ("server_count", "i8"),
+            ("job_id", "i8"),
+            ("kind", "i1"),
+        ],
+    )
+    rectangles["start"] = np.asarray(columns["start_times"])[jobs]
+    rectangles["end"] = np.asarray(columns["end_times"])[jobs]
+    rectangles["first_server"] = first_servers
+    rectangles["server_count"] = server_counts
+    rectangles["job_id"] = np.asarray(columns["job_ids"])[jobs]
+    rectangles["kind"] = np.asarray(columns["kinds"])[jobs]
+    return rectangles[np.argsort(rectangles["start"], kind="stable")]
+
+
+def _occupancy(rectangles, time_min, time_max, bucket_count, server_count, group_size):
+    # The busy and powered-off fractions of every row of servers and time bucket.
+    # The rectangles are split along the rows. The area of a part of weight w, from
+    # s to e, before the bucket edge x is w * (ramp(x - s) - ramp(x - e)), so the
+    # areas of all the parts at the edge x are x * W(x) - P(x), W and P being the
+    # cumulated signed weights and weighted positions of the part ends before x.
+    row_count = -(-server_count // group_size)
+    first_rows = rectangles["first_server"] // group_size
+    last_rows = (
+        rectangles["first_server"] + rectangles["server_count"] - 1
+    ) // group_size
+    part_counts = last_rows - first_rows + 1
+    parts = np.repeat(np.arange(len(rectangles)), part_counts)
+    part_offsets = np.repeat(np.cumsum(part_counts) - part_counts, part_counts)
+    rows = first_rows[parts] + np.arange(len(parts)) - part_offsets
+    first_servers = rectangles["first_server"][parts]
+    end_servers = first_servers + rectangles["server_count"][parts]
+    weights = np.minimum(end_servers, (rows + 1) * group_size) - np.maximum(
+        first_servers, rows * group_size
+    )
+
+    bucket_width = (time_max - time_min) / bucket_count
+    starts = (rectangles["start"][parts] - time_min) / bucket_width
+    ends = (rectangles["end"][parts] - time_min) / bucket_width
+    is_off = rectangles["kind"][parts] == JobHistory.Kind.POWER_OFF
+
+    edge_count = bucket_count + 1
+    row_sizes = np.minimum(
+        group_size, server_count - np.arange(row_count) * group_size
+    )
+    occupancies = []
+    for mask in (~is_off, is_off):
+        positions = np.concatenate([starts[mask], ends[mask]])
+        signed_weights = np.concatenate([weights[mask], -weights[mask]])
+        edges = np.tile(rows[mask], 2) * edge_count + np.clip(
+            np.ceil(positions), 0, bucket_count
+        ).astype(np.int64)
+        size = row_count * edge_count
+        cumulated_weights = np.bincount(edges, signed_weights, size)
+        cumulated_positions = np.bincount(edges, signed_weights * positions, size)
+        areas = np.arange(edge_count) * cumulated_weights.reshape(
+            row_count, edge_count
+        ).cumsum(1) - cumulated_positions.reshape(row_count, edge_count).cumsum(1)
+        occupancies.append(np.diff(areas, axis=1) / row_sizes[:, None])
+    return occupancies
+
+
+def _halve(occupancy):
+    if occupancy.shape[1] % 2:
+        occupancy = np.pad(occupancy, ((0, 0), (0, 1)), mode="edge")
+    return (occupancy[:, 0::2] + occupancy[:, 1::2]) / 2
+
+
+def _quantize(occupancy):
+    return np.clip(np.rint(occupancy * 255), 0, 255).astype(np.uint8)
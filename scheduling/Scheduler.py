@@ -1,14 +1,21 @@
+import logging
 from copy import deepcopy
-from dataclasses import astuple, dataclass
-from operator import attrgetter, methodcaller
-from random import random, sample, uniform
-from statistics import mean, stdev
+from dataclasses import astuple, dataclass, replace
+from heapq import heapify, heappop
+from math import inf, sqrt
+from random import Random, uniform
+from time import perf_counter
 
 import structlog
 
 from .Job import Job
+from .JobHistory import JobHistory
+from .JobLog import JobLog
+from .JobRegistry import JobRegistry
 from .JobRequest import JobRequest
-from .Server import Server
+from .PhaseMetrics import PhaseMetrics
+from .RequestQueue import RequestQueue
+from .Server import Server, ServerPool
 
 
 @dataclass
@@ -26,7 +33,7 @@ class SchedulerConfig:
     shutdown_time_prob: float = 0.717  #: The probability of choosing shutdown_time_short.
 
     @classmethod
-    def random(cls):
+    def random(cls, rng=None):
         """Generates random values for the parameters of the scheduler.
 
         reconfig_scale: is sampled from a Uniform distribution (0.001, 1.0).\n
@@ -38,16 +45,21 @@ class SchedulerConfig:
         shutdown_time_long: is sampled from a Uniform distribution (370, 4000).\n
         shutdown_time_prob: is sampled from a Uniform distribution (0.0001, 1.0).\n
 
+        Args:
+            rng: The random.Random generator to sample from, defaults to the \
+            global generator of the random module.
+
         """
+        sample = uniform if rng is None else rng.uniform
         c = SchedulerConfig()
-        c.reconfig_scale = uniform(0.001, 1.0)
-        c.reconfig_weight = uniform(0.01, 1.0)
-        c.alpha_weight = uniform(0.001, 1.0)
-        c.shutdown_scale = uniform(0.001, 1.0)
-        c.shutdown_weight = uniform(0.01, 1.0)
-        c.shutdown_time_short = uniform(370, 1200)
-        c.shutdown_time_long = uniform(370, 4000)
-        c.shutdown_time_prob = uniform(0.0001, 1.0)
+        c.reconfig_scale = sample(0.001, 1.0)
+        c.reconfig_weight = sample(0.01, 1.0)
+        c.alpha_weight = sample(0.001, 1.0)
+        c.shutdown_scale = sample(0.001, 1.0)
+        c.shutdown_weight = sample(0.01, 1.0)
+        c.shutdown_time_short = sample(370, 1200)
+        c.shutdown_time_long = sample(370, 4000)
+        c.shutdown_time_prob = sample(0.0001, 1.0)
         return c
 
     def to_dict(self):
@@ -67,29 +79,162 @@ class SchedulerStats:
     """A container for the output statistics of the scheduler.
     """
 
-    complete_jobs: dict  #: The list of the jobs that had been scheduled.
+    complete_jobs: JobHistory
+    """The jobs that had been scheduled, a JobHistory or the JobLog they were \
+    streamed to."""
     start_time: int  #: The starting time of the scheduler.
     end_time: int  #: The ending time of the scheduler.
     work_duration: int  #: The span of time during which the scheduling took place.
     reconfig_count: int  #: The total number of reconfigurations that took place.
-    power_off_count: int  #: The total number of power-offs that took place.
+    power_off_count: int  #: The total number of server power-offs that took place.
     min_stretch_time: int  #: The minimum obtained stretch time.
     max_stretch_time: int  #: The maximum obtained stretch time.
     mean_stretch_time: float  #: The mean obtained stretch time.
     stdev_stretch_time: float  #: The standard deviation of the stretch time.
     average_power_norm: float  #: The mean obtained normalized power.
     cost: float  #: The calculated cost resulting from the scheduling of jobs.
+    metrics: PhaseMetrics = None
+    """The timers and counters of the phases, None unless the scheduler was \
+    instrumented."""
 
     def to_dict(self):
         """Converts the attributes of a SchedulerStats object into a dictionary.
 
-        Discards the list of the completed jobs from the returned dictionary.
+        Discards the list of the completed jobs and the metrics from the returned \
+        dictionary.
         """
-        dict_obj = deepcopy(self.__dict__)
-        dict_obj.pop("complete_jobs")
+        dict_obj = deepcopy(
+            {
+                key: value
+                for key, value in self.__dict__.items()
+                if key not in ("complete_jobs", "metrics")
+            }
+        )
         return dict_obj
 
 
+class StatsAccumulator:
+    """An accumulator of the statistics of a scheduler.
+
+    Every completed job updates the work span, the energy consumption, the busy
+    area and the counters, every completed request updates the moments of the
+    stretch time. SchedulerStats are then built in O(1) without the jobs history.
+    """
+
+    def __init__(self, server_count: int):
+        """Creates an empty StatsAccumulator object.
+
+        Args:
+            server_count: The total number of servers in the cluster.
+
+        """
+        self.server_count = server_count  #: The total number of servers.
+        self.start_time = inf  #: The starting time of the first job.
+        self.end_time = -inf  #: The ending time of the last job.
+        self.energy = 0  #: The energy consumed by the jobs (in Watt-seconds).
+        self.area = 0  #: The time during which servers were running jobs.
+        self.reconfig_count = 0  #: The number of completed reconfigurations.
+        self.power_off_count = 0  #: The number of servers powered off.
+        self.stretch_count = 0  #: The number of completed requests.
+        self.stretch_mean = 0  #: The running mean of the stretch times.
+        self.stretch_m2 = 0
+        """The running sum of the squared deviations of the stretch times."""
+        self.min_stretch_time = inf  #: The minimum stretch time.
+        self.max_stretch_time = -inf  #: The maximum stretch time.
+
+    def add_job(self, job: Job, job_req: JobRequest = None):
+        """Accounts for a completed job.
+
+        Args:
+            job: The completed Job.
+            job_req: The JobRequest the job completes, if any.
+        """
+        srv_count = len(job.servers)
+        duration = job.duration
+        self.start_time = min(self.start_time, job.start_time)
+        self.end_time = max(self.end_time, job.end_time)
+        if job.is_power_off():
+            self.energy += Server.Consumption.reboot(duration) * srv_count
+            self.power_off_count += srv_count
+        else:
+            self.energy += Server.Consumption.active(duration) * srv_count
+            if job.is_reconfiguration():
+                self.reconfig_count += 1
+        self.area += duration * srv_count
+
+        if job_req is not None:
+            self._add_stretch_time((job.end_time - job_req.sub_time) / job_req.mass)
+
+    @property
+    def work_duration(self):
+        """float: The span of time during which the jobs were run."""
+        return self.end_time - self.start_time
+
+    @property
+    def stdev_stretch_time(self):
+        """float: The standard deviation of the stretch times."""
+        if self.stretch_count < 2:
+            return 0
+        return sqrt(self.stretch_m2 / (self.stretch_count - 1))
+
+    @property
+    def average_power_norm(self):
+        """float: The average power consumption normalized by the idle power."""
+        # adding idle time
+        energy_idle = Server.Consumption.idle(
+            self.work_duration * self.server_count - self.area
+        )
+        idle_power = Server.Consumption.idle(self.work_duration) * self.server_count
+        return (self.energy + energy_idle) / idle_power
+
+    def to_stats(
+        self,
+        complete_jobs: JobHistory,
+        stretch_time_weight: float,
+        energy_weight: float,
+        metrics=None,
+    ):
+        """Builds the SchedulerStats of the accumulated jobs.
+
+        Args:
+            complete_jobs: The completed jobs kept by the scheduler.
+            stretch_time_weight: An exponent weight for the mean stretch time\
+             in the cost function.
+            energy_weight: An exponent weight for the average normalized power\
+             stretch time in the cost function.
+            metrics: The PhaseMetrics of the scheduler, if instrumented.
+
+        Returns:
+            SchedulerStats: A SchedulerStats object is returned.
+        """
+        average_power_norm = self.average_power_norm
+        return SchedulerStats(
+            complete_jobs=complete_jobs,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            work_duration=self.work_duration,
+            reconfig_count=self.reconfig_count,
+            power_off_count=self.power_off_count,
+            min_stretch_time=self.min_stretch_time,
+            max_stretch_time=self.max_stretch_time,
+            mean_stretch_time=self.stretch_mean,
+            stdev_stretch_time=self.stdev_stretch_time,
+            average_power_norm=average_power_norm,
+            cost=self.stretch_mean ** stretch_time_weight
+            * average_power_norm ** energy_weight,
+            metrics=metrics,
+        )
+
+    def _add_stretch_time(self, stretch_time):
+        # Welford's online algorithm
+        self.stretch_count += 1
+        delta = stretch_time - self.stretch_mean
+        self.stretch_mean += delta / self.stretch_count
+        self.stretch_m2 += delta * (stretch_time - self.stretch_mean)
+        self.min_stretch_time = min(self.min_stretch_time, stretch_time)
+        self.max_stretch_time = max(self.max_stretch_time, stretch_time)
+
+
 class Scheduler(object):
     """A representation of a scheduler that assigns Jobs to be run on Servers.
     """
@@ -101,6 +246,11 @@ class Scheduler(object):
         reconfig_enabled=True,
         power_off_enabled=True,
         param_enabled=True,
+        trace=None,
+        keep_history=True,
+        seed_num=None,
+        job_sink=None,
+        instrument=False,
     ):
         """Creates a Scheduler object.
 
@@ -112,12 +262,25 @@ class Scheduler(object):
             param_enabled: A flag for enabling the decision taking process,\
             if False the scheduler will always reconfigure jobs, respectively \
             shut down idle servers.
+            trace: A flag for emitting debug events while scheduling. Defaults \
+            to whether the scheduler's logger is enabled for debug messages.
+            keep_history: A flag for keeping the completed jobs, needed to draw \
+            the schedule. The statistics do not depend on it.
+            seed_num: A seed for the random decisions of the scheduler.
+            job_sink: A JobLog the completed jobs are streamed to when they are \
+            kept. If None, they are kept in memory in a JobHistory.
+            instrument: A flag for timing the phases of the updates of the \
+            schedule and counting their decisions in PhaseMetrics.
 
         """
         self.servers = [
             Server(i) for i in range(server_count)
         ]  #: The total number of servers in the cluster.
+        self.av_servers = ServerPool(self.servers)
+        """ServerPool: The servers that are not running any Job."""
         self.conf = conf  #: The configuration of the scheduler.
+        self.rng = Random(seed_num)
+        """random.Random: The generator of the random decisions of the scheduler."""
         self.param_enabled = param_enabled
         """A flag for enabling the decision taking process,\
         if False the scheduler will always reconfigure jobs, respectively \
@@ -125,14 +288,31 @@ class Scheduler(object):
         self.reconfig_enabled = reconfig_enabled
         """A flag for enabling reconfigurations."""
         self.power_off_enabled = power_off_enabled  #: A flag for enabling power-offs.
-        self.req_queue = []  #: The queue of the scheduler. Holds JobRequest objects.
+        self.req_queue = RequestQueue()
+        """RequestQueue: The queue of the scheduler. Holds JobRequest objects."""
         self.req_by_id = {}
         """A dictionary where the keys are the ids of the \
          JobRequests objects in the Scheduler's queue. Helps tracking a \
-         splitten job due to one or several reconfigurations."""
-        self.active_jobs = []  #: A list of all running jobs.
-        self.complete_jobs = {}  #: A list of the completed jobs.
+         splitten job due to one or several reconfigurations until it completes."""
+        self.active_jobs = JobRegistry()
+        """JobRegistry: The running jobs indexed by their ending time."""
+        self.keep_history = keep_history
+        """A flag for keeping the completed jobs once they are accounted for."""
+        self.complete_jobs = JobHistory() if job_sink is None else job_sink
+        """The completed jobs, a JobHistory or a JobLog."""
+        self.accumulator = StatsAccumulator(server_count)
+        """StatsAccumulator: The statistics of the completed jobs."""
+        self.job_start_handler = None
+        """A method handler notified with every Job started by the scheduler."""
         self.logger = structlog.getLogger(__name__)  #: The scheduler's logger.
+        if trace is None:
+            trace = logging.getLogger(__name__).isEnabledFor(logging.DEBUG)
+        self.trace = trace
+        """A flag for emitting debug events while scheduling. The events only \
+        hold identifiers and counts to keep them cheap."""
+        self.metrics = PhaseMetrics() if instrument else None
+        """PhaseMetrics: The timers and counters of the phases of the updates, \
+        None unless instrumented."""
 
     def is_working(self):
         """Checks whether the scheduler has finished scheduling.
@@ -141,7 +321,7 @@ class Scheduler(object):
             True if successful, False otherwise.
         """
         return self.req_queue or (
-            self.active_jobs and not all(job.is_power_off() for job in self.active_jobs)
+            len(self.active_jobs) > self.active_jobs.power_off_count
         )
 
     def stop(self, time):
@@ -151,9 +331,12 @@ class Scheduler(object):
             time: The time at which the scheduler stops working.
 
         """
-        for job in self.active_jobs:
+        jobs = list(self.active_jobs)
+        for job in jobs:
             job.end_time = time
-        self._remove_job(*self.active_jobs)
+        self._remove_job(*jobs)
+        if isinstance(self.complete_jobs, JobLog):
+            self.complete_jobs.flush()
 
     def schedule(self, job_request: JobRequest):
         """Handles new upcoming JobRequests.
@@ -162,8 +345,7 @@ class Scheduler(object):
             job_request: The JobRequest object to be scheduled by the Scheduler.
 
         """
-        self.req_queue.append(job_request)
-        self.req_queue.sort(key=attrgetter("sub_time"), reverse=True)
+        self.req_queue.push(job_request)
         self.req_by_id[job_request.id] = job_request
 
     def update_schedule(self, time):
@@ -172,111 +354,225 @@ class Scheduler(object):
         Args:
             time: The time at which the schedule need to be updated.
         """
-        self._remove_job(*[job for job in self.active_jobs if job.is_complete(time)])
-
-        # Schedule jobs in the queue
-        av_servers = [server for server in self.servers if not server.is_busy(time)]
-        self.logger.debug(
-            "update_schedule",
-            time=time,
-            av_servers=av_servers,
-            req_queue=self.req_queue,
-        )
+        if self.metrics is not None:
+            self._update_schedule_measured(time)
+            return
+        self._retire_jobs(time)
         # Priotitize FIFO scheduling as long as there are jobs in the queue
+        self._schedule_requests(time)
+        if self.reconfig_enabled:
+            self._reconfigure_jobs(time)
+        if self.power_off_enabled:
+            self._power_off_servers(time)
+
+    def _update_schedule_measured(self, time):
+        # update_schedule, timing every phase and adding up the counts of the
+        # decisions it returns.
+        metrics = self.metrics
+        metrics.update_count += 1
+        start = perf_counter()
+        metrics.jobs_retired += self._retire_jobs(time)
+        end = perf_counter()
+        metrics.retire_time += end - start
+
+        start = end
+        metrics.jobs_started += self._schedule_requests(time)
+        end = perf_counter()
+        metrics.schedule_time += end - start
+
+        if self.reconfig_enabled:
+            start = end
+            considered, accepted = self._reconfigure_jobs(time)
+            end = perf_counter()
+            metrics.reconfigure_time += end - start
+            metrics.reconfigs_considered += considered
+            metrics.reconfigs_accepted += accepted
+
+        if self.power_off_enabled:
+            start = end
+            considered, accepted = self._power_off_servers(time)
+            metrics.power_off_time += perf_counter() - start
+            metrics.shutdowns_considered += considered
+            metrics.shutdowns_accepted += accepted
+
+    def _retire_jobs(self, time):
+        jobs = self.active_jobs.pop_complete(time)
+        self._remove_job(*jobs)
+        if self.trace:
+            self.logger.debug(
+                "update_schedule",
+                time=time,
+                av_servers=len(self.av_servers),
+                req_queue=len(self.req_queue),
+                active_jobs=len(self.active_jobs),
+            )
+        return len(jobs)
+
+    def _schedule_requests(self, time):
+        av_servers = self.av_servers
+        started = 0
         while self.req_queue and av_servers:
-            job_req = self.req_queue[-1]
+            job_req = self.req_queue.peek()
             job_servers = self._allocate_servers(av_servers, job_req)
             if not job_servers:
                 break
-            self.logger.debug("schedule job req", time=time, req=job_req)
+            if self.trace:
+                self.logger.debug("schedule job req", time=time, req=job_req.id)
             job = Job.from_request(job_req, job_servers, start_time=time)
             self._start_job(job)
             self.req_queue.pop()
-            av_servers = [server for server in av_servers if server not in job_servers]
-
-        # Applies a reconfiguration
-        if self.reconfig_enabled:
-            jobs_by_mass = sorted(
-                self.active_jobs, key=methodcaller("remaining_mass", time)
-            )
-            while jobs_by_mass and av_servers:
-                job = jobs_by_mass[0]
-                if self._is_job_reconfigurable(job, av_servers, time):
-                    av_servers = self._reconfigure_job(job, av_servers, time)
-                jobs_by_mass.pop(0)
-
-        # Applies power-offs
-        if self.power_off_enabled:
-            for server in list(av_servers):
-                if not self._shutdown_server(av_servers):
-                    break
+            started += 1
+        return started
+
+    def _reconfigure_jobs(self, time):
+        av_servers = self.av_servers
+        considered = accepted = 0
+        for job in self._reconfigurable_jobs(time):
+            if not av_servers:
+                break
+            considered += 1
+            if self._is_job_reconfigurable(job, av_servers, time):
+                self._reconfigure_job(job, av_servers, time)
+                accepted += 1
+        return considered, accepted
+
+    def _reconfigurable_jobs(self, time):
+        # The running jobs that could use more servers, lazily by remaining mass.
+        # The loops stop once the servers are exhausted, usually after a few jobs.
+        if not self.av_servers:
+            return
+        heap = [
+            (job.remaining_mass(time), i, job)
+            for i, job in enumerate(self.active_jobs.reconfigurable())
+        ]
+        heapify(heap)
+        while heap:
+            yield heappop(heap)[-1]
+
+    def _power_off_servers(self, time):
+        # Every power-off takes one available server and the decisions only depend
+        # on their number. The loop over the decisions stops at the first refusal
+        # and the allowed numbers of servers form a range ending at the available
+        # ones, so the lowest allowed number is found by bisection.
+        av_count = len(self.av_servers)
+        power_off_count = 0
+        if av_count and self._allow_power_off(av_count):
+            low, high = 1, av_count
+            while low < high:
+                middle = (low + high) // 2
+                if self._allow_power_off(middle):
+                    high = middle
+                else:
+                    low = middle + 1
+            power_off_count = av_count - low + 1
+        # The loop ends on a refusal unless the servers are exhausted.
+        considered = power_off_count + (power_off_count < av_count)
 
-                shutdown, duration = self._allow_shutdown(av_servers)
-                if not shutdown:
-                    continue
+        self._power_off(power_off_count, time)
+        return considered, power_off_count
 
-                power_off = Job.make_power_off(
-                    [server], start_time=time, duration=duration
-                )
-                self._start_job(power_off)
-                av_servers.remove(server)
-
-    def _allow_shutdown(self, av_servers: list):
-        # Shutdown decision process
+    def _allow_power_off(self, av_count: int):
+        # Shutdown decision process for one of av_count available servers
+        if self.req_queue and av_count <= self.req_queue.required_servers:
+            return False
         if self.param_enabled:
-            if (
+            return not (
                 0.5
-                > ((len(av_servers) / len(self.servers)) ** self.conf.shutdown_weight)
+                > ((av_count / len(self.servers)) ** self.conf.shutdown_weight)
                 * self.conf.shutdown_scale
-            ):
-                return False, 0
-
-            if random() < self.conf.shutdown_time_prob:
-                shutdown_duration = self.conf.shutdown_time_short
-            else:
-                shutdown_duration = self.conf.shutdown_time_long
-            return True, shutdown_duration
-
+            )
+        return True
+
+    def _power_off(self, count: int, time):
+        # A duration is drawn for every server, the servers shut down for the same
+        # duration share a Power-off Job, the one of the first draw coming first:
+        # at most two Jobs per update. The servers are taken from the pool at once.
+        if not count:
+            return
+        servers = self.av_servers.take(count)
+        if not self.param_enabled:
+            durations = [(self.conf.shutdown_time_short, servers)]
         else:
-            return True, self.conf.shutdown_time_short
+            random = self.rng.random
+            draws = [random() < self.conf.shutdown_time_prob for _ in range(count)]
+            short_count = sum(draws)
+            durations = [
+                (self.conf.shutdown_time_short, servers[:short_count]),
+                (self.conf.shutdown_time_long, servers[short_count:]),
+            ]
+            if not draws[0]:
+                durations.reverse()
+
+        servers_by_duration = {}
+        for duration, duration_servers in durations:
+            if duration_servers:
+                servers_by_duration.setdefault(duration, []).extend(duration_servers)
+        for duration, duration_servers in servers_by_duration.items():
+            self._start_job(
+                Job.make_power_off(duration_servers, start_time=time, duration=duration)
+            )
 
     def _start_job(self, *jobs):
         for job in jobs:
-            self.active_jobs.append(job)
-            self.logger.debug(
-                "new job", server_count=len(job.servers), active_jobs=self.active_jobs
-            )
-            for server in job.servers:
-                server.add_job(job)
-
-    def _remove_job(self, *jobs):
+            self.active_jobs.add(job)
+            if self.trace:
+                self.logger.debug(
+                    "new job",
+                    job=job.id,
+                    server_count=len(job.servers),
+                    active_jobs=len(self.active_jobs),
+                )
+            # The idle servers of a Power-off Job are already out of the pool and
+            # only run it, they are not given the job one by one.
+            if not job.is_power_off():
+                for server in job.servers:
+                    if not server.jobs:
+                        self.av_servers.remove(server)
+                    server.add_job(job)
+            if self.job_start_handler is not None:
+                self.job_start_handler(job)
+
+    def _remove_job(self, *jobs, interrupted=False):
         for job in jobs:
             self.active_jobs.remove(job)
-            self.logger.debug(f"remove job", job=job, active_jobs=self.active_jobs)
-            for server in job.servers:
-                server.remove_job(job)
+            if self.trace:
+                self.logger.debug(
+                    "remove job",
+                    job=job.id,
+                    end_time=job.end_time,
+                    active_jobs=len(self.active_jobs),
+                )
+            if job.is_power_off():
+                self.av_servers.extend(job.servers)
+            else:
+                for server in job.servers:
+                    server.remove_job(job)
+                    if not server.jobs:
+                        self.av_servers.add(server)
+
+            job_req = None
+            if not interrupted and not job.is_power_off() and job.mass > 0:
+                job_req = self.req_by_id.pop(job.id)
+            self.accumulator.add_job(job, job_req)
 
-            completed_jobs = self.complete_jobs.get(job.id, [])
-            completed_jobs.append(job)
-            self.complete_jobs[job.id] = completed_jobs
+            if self.keep_history:
+                self.complete_jobs.append(job)
 
-    def _reconfigure_job(self, job: Job, av_servers: list, time):
+    def _reconfigure_job(self, job: Job, av_servers: ServerPool, time):
         job.interupt(time)
         extra_srv_count = min(job.max_server_count - job.server_count, len(av_servers))
-        extra_srvs = sample(av_servers, extra_srv_count)
+        extra_srvs = self.rng.sample(av_servers, extra_srv_count)
         job_servers = job.servers + extra_srvs
-        av_servers = [server for server in av_servers if server not in extra_srvs]
 
-        self.logger.debug(
-            "reconfigure job", time=time, job=job, server_count=len(job_servers)
-        )
+        if self.trace:
+            self.logger.debug(
+                "reconfigure job", time=time, job=job.id, server_count=len(job_servers)
+            )
         reconfig_job, job_rest = job.reconfigure(job_servers, time)
-        self._remove_job(job)
+        self._remove_job(job, interrupted=True)
         self._start_job(reconfig_job, job_rest)
 
-        return av_servers
-
-    def _is_job_reconfigurable(self, job: Job, av_servers: list, time):
+    def _is_job_reconfigurable(self, job: Job, av_servers: ServerPool, time):
         if not job.is_reconfigurable():
             return False
 
@@ -295,23 +591,19 @@ class Scheduler(object):
         else:
             return extra_srv_count > 0
 
-    def _shutdown_server(self, av_servers: list):
-        if not self.req_queue:
-            return True
-
-        required_servers = sum(req.min_num_servers for req in self.req_queue)
-        return len(av_servers) > required_servers
-
-    def _allocate_servers(self, available_servers: list, job_req: JobRequest):
+    def _allocate_servers(self, available_servers: ServerPool, job_req: JobRequest):
         min_servers = min(job_req.max_num_servers, len(available_servers))
         if min_servers < job_req.min_num_servers:
             return []
-        return sample(available_servers, k=min_servers)
+        return self.rng.sample(available_servers, k=min_servers)
 
     #############################################
 
     def stats(self, stretch_time_weight: float, energy_weight: float):
-        """Updates the schedule at time t.
+        """Gives the statistics of the scheduling.
+
+        The statistics are accumulated as the jobs are retired, computing them is\
+        O(1).
 
         Args:
             stretch_time_weight: An exponent weight for the mean stretch time\
@@ -323,77 +615,7 @@ class Scheduler(object):
             SchedulerStats: A SchedulerStats object is returned.
 
         """
-        stretch_times = self._stretch_times()
-        start_time, end_time = self._work_span()
-        return SchedulerStats(
-            complete_jobs=self.complete_jobs,
-            start_time=start_time,
-            end_time=end_time,
-            work_duration=self._work_duration(),
-            reconfig_count=self._num_reconfig_job(),
-            power_off_count=self._num_power_off(),
-            min_stretch_time=min(stretch_times),
-            max_stretch_time=max(stretch_times),
-            mean_stretch_time=mean(stretch_times),
-            stdev_stretch_time=stdev(stretch_times),
-            average_power_norm=self._normalized_average_power(),
-            cost=self._cost_function(stretch_times, stretch_time_weight, energy_weight),
-        )
-
-    def _work_span(self):
-        jobs = [job for jobs_by_id in self.complete_jobs.values() for job in jobs_by_id]
-        first = min(jobs, key=attrgetter("start_time"))
-        last = max(jobs, key=attrgetter("end_time"))
-        return first.start_time, last.end_time
-
-    def _work_duration(self):
-        jobs = [job for jobs_by_id in self.complete_jobs.values() for job in jobs_by_id]
-        first = min(jobs, key=attrgetter("start_time"))
-        last = max(jobs, key=attrgetter("end_time"))
-        return last.end_time - first.start_time
-
-    def _stretch_times(self):
-        def stretch_time(job_req):
-            last = self.complete_jobs[job_req.id][-1]
-            return (last.end_time - job_req.sub_time) / job_req.mass
-
-        return [stretch_time(j) for j in self.req_by_id.values()]
-
-    def _normalized_average_power(self):
-        def average_power(work_duration):
-            jobs = [
-                job for jobs_by_id in self.complete_jobs.values() for job in jobs_by_id
-            ]
-            total_energy = 0
-            area = 0
-            for job in jobs:
-                srv_count = len(job.servers)
-                if job.is_power_off():
-                    total_energy += Server.Consumption.reboot(job.duration) * srv_count
-                else:
-                    total_energy += Server.Consumption.active(job.duration) * srv_count
-                area += job.duration * srv_count
-            # adding idle time
-            energy_idle = Server.Consumption.idle(
-                work_duration * len(self.servers) - area
-            )
-            return total_energy + energy_idle
-
-        work_duration = self._work_duration()
-        idle_power = Server.Consumption.idle(work_duration) * len(self.servers)
-        return average_power(work_duration) / idle_power
-
-    def _num_reconfig_job(self):
-        return sum(
-            sum(job.is_reconfiguration() for job in jobs)
-            for jobs in self.complete_jobs.values()
-        )
-
-    def _num_power_off(self):
-        return len(self.complete_jobs.get(Job.POWER_OFF_ID, []))
-
-    def _cost_function(self, stretch_times, stretch_time_weight, energy_weight):
-        return (
-            mean(stretch_times) ** stretch_time_weight
-            * self._normalized_average_power() ** energy_weight
+        metrics = None if self.metrics is None else replace(self.metrics)
+        return self.accumulator.to_stats(
+            self.complete_jobs, stretch_time_weight, energy_weight, metrics
         )
@@ -1,4 +1,6 @@
+from collections.abc import Sequence
 from enum import IntEnum
+from operator import attrgetter
 
 from .Job import Job
 
@@ -73,26 +75,28 @@ class Server:
 
         """
         self.index = index  #: The Server object's identifier.
-        self.jobs = []  #: A List of Jobs assigned to the Server object.
+        self.jobs = {}
+        """The Jobs assigned to the Server object, as keys of an insertion-ordered \
+        dictionary for O(1) removals."""
 
     def __repr__(self):
-        return f"Server-{self.index}: {self.jobs}"
+        return f"Server-{self.index}: {list(self.jobs)}"
 
     def add_job(self, job: Job):
-        """Appends a job into the Server object's jobs list.
+        """Appends a job into the Server object's jobs.
 
         Args:
-            job: The Job object to be added to the Server object's jobs list.
+            job: The Job object to be added to the Server object's jobs.
         """
-        self.jobs.append(job)
+        self.jobs[job] = None
 
     def remove_job(self, job: Job):
-        """Removes a job from the Server object's jobs list.
+        """Removes a job from the Server object's jobs.
 
         Args:
-            job: The Job object to be removed from the Server object' jobs list.
+            job: The Job object to be removed from the Server object's jobs.
         """
-        self.jobs.remove(job)
+        del self.jobs[job]
 
     def is_busy(self, time):
         """Checks whether a Server object is running any Jobs at a time t
@@ -104,3 +108,95 @@ class Server:
             True if successful, False otherwise.
         """
         return any(job.is_running(time) for job in self.jobs)
+
+
+class ServerPool(Sequence):
+    """An indexed set of Servers.
+
+    Servers can be added and removed in O(1) and, the pool being a sequence, k of
+    them can be sampled with random.sample in O(k) regardless of the pool size.
+    Blocks of servers are taken from and given back to the pool at once, with
+    list operations instead of one call per server. The order of the servers in
+    the pool is not preserved by removals.
+    """
+
+    def __init__(self, servers=()):
+        """Creates a ServerPool object.
+
+        Args:
+            servers: The Server objects initially in the pool.
+
+        """
+        self._servers = []  #: The Server objects in the pool.
+        self._positions = {}
+        """The position in the pool of each Server index. The positions of the \
+        taken servers are left behind, a position only holds if the server is \
+        found there."""
+        for server in servers:
+            self.add(server)
+
+    def __len__(self):
+        return len(self._servers)
+
+    def __getitem__(self, position):
+        return self._servers[position]
+
+    def __contains__(self, server):
+        position = self._positions.get(server.index)
+        return (
+            position is not None
+            and position < len(self._servers)
+            and self._servers[position] is server
+        )
+
+    def __repr__(self):
+        return repr(self._servers)
+
+    def add(self, server: Server):
+        """Adds a Server to the pool if it is not already in it.
+
+        Args:
+            server: The Server object to be added.
+        """
+        if server not in self:
+            self._positions[server.index] = len(self._servers)
+            self._servers.append(server)
+
+    def extend(self, servers: list):
+        """Adds Servers that are not in the pool, at once.
+
+        Args:
+            servers: The Server objects to be added.
+        """
+        start = len(self._servers)
+        self._servers.extend(servers)
+        self._positions.update(
+            zip(map(attrgetter("index"), servers), range(start, len(self._servers)))
+        )
+
+    def remove(self, server: Server):
+        """Removes a Server from the pool.
+
+        Args:
+            server: The Server object to be removed.
+        """
+        position = self._positions.pop(server.index)
+        last = self._servers.pop()
+        if last is not server:
+            self._servers[position] = last
+            self._positions[last.index] = position
+
+    def take(self, count: int):
+        """Removes the last Servers of the pool, at once.
+
+        Args:
+            count: The number of Servers to be removed.
+
+        Returns:
+            list: The removed Server objects.
+        """
+        if not count:
+            return []
+        servers = self._servers[-count:]
+        del self._servers[-count:]
+        return servers
@@ -0,0 +1,167 @@
+from enum import IntEnum
+from heapq import heappop, heappush
+from itertools import count
+from math import ceil
+
+from .Job import Job
+from .Scheduler import Scheduler
+
+
+class Event(IntEnum):
+    """The kinds of events processed by a Simulation.
+
+    The values give the processing order of events happening at the same time.
+    """
+
+    SUBMISSION = 0  #: A JobRequest is submitted to the scheduler.
+    JOB_END = 1  #: A Job finishes its computation.
+    RECONFIGURATION_END = 2  #: A reconfiguration finishes transferring data.
+    POWER_OFF_END = 3  #: A server is booted again after a power-off.
+
+    @classmethod
+    def from_job(cls, job: Job):
+        """Gives the kind of event that marks the end of a Job.
+
+        Args:
+            job: The Job whose end is scheduled.
+
+        Returns:
+            Event: The Event matching the type of the Job.
+        """
+        if job.is_power_off():
+            return cls.POWER_OFF_END
+        if job.is_reconfiguration():
+            return cls.RECONFIGURATION_END
+        return cls.JOB_END
+
+
+class EventQueue:
+    """A priority queue of timed events.
+
+    Events happening at the same time are popped in the order they were pushed.
+    """
+
+    def __init__(self):
+        """Creates an empty EventQueue object."""
+        self._heap = []  #: The binary heap holding the events.
+        self._counter = count()  #: A tie breaker keeping the queue stable.
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, time, event: Event, payload=None):
+        """Adds an event to the queue.
+
+        Args:
+            time: The instant at which the event happens.
+            event: The kind of the event.
+            payload: The object the event relates to.
+        """
+        heappush(self._heap, (time, next(self._counter), event, payload))
+
+    def peek(self):
+        """Gives the earliest event of the queue without removing it.
+
+        Returns:
+            tuple: The time, the kind and the payload of the event, None if the \
+            queue is empty.
+        """
+        if not self._heap:
+            return None
+        time, _, event, payload = self._heap[0]
+        return time, event, payload
+
+    def pop(self):
+        """Removes the earliest event from the queue.
+
+        Returns:
+            tuple: The time, the kind and the payload of the event.
+        """
+        time, _, event, payload = heappop(self._heap)
+        return time, event, payload
+
+
+class Simulation:
+    """A discrete-event simulation of a Scheduler fed with JobRequests.
+
+    Instead of updating the schedule at a fixed rate, the simulation jumps from
+    one event to the next: submissions, job completions, reconfiguration ends
+    and power-off ends. The schedule is only updated when something happened.
+    """
+
+    def __init__(self, scheduler: Scheduler, time_step=10):
+        """Creates a Simulation object.
+
+        Args:
+            scheduler: The Scheduler to be simulated.
+            time_step: The resolution of the simulated clock. Event times are\
+            rounded up to a multiple of time_step, which reproduces the \
+            schedules of a scheduler updated every time_step seconds. \
+            A time_step of 0 processes the events at their exact time.
+
+        """
+        self.scheduler = scheduler  #: The simulated Scheduler.
+        self.time_step = time_step  #: The resolution of the simulated clock.
+        self.events = EventQueue()  #: The queue of the upcoming events.
+        self.update_count = 0  #: The number of times the schedule was updated.
+        self.pending_submission = False
+        """A flag telling whether JobRequests remain to be submitted."""
+        self.scheduler.job_start_handler = self._on_job_start
+
+    def run(self, job_requests, start_time=0):
+        """Runs the simulation until every JobRequest has been scheduled and run.
+
+        JobRequests are consumed lazily and must be ordered by submission time.
+
+        Args:
+            job_requests: An iterable of JobRequest objects.
+            start_time: The instant at which the simulation starts.
+
+        Returns:
+            The instant at which the scheduler can be stopped.
+        """
+        requests = iter(job_requests)
+        self._submit_next(requests)
+        time = start_time
+        while True:
+            self._process_events(time, requests)
+            self.scheduler.update_schedule(time)
+            self.update_count += 1
+
+            if not self.pending_submission and not self.scheduler.is_working():
+                break
+            next_time = self._next_event_time()
+            if next_time is None:
+                break
+            time = max(self._round(next_time), time + self.time_step)
+        return time + self.time_step
+
+    def _submit_next(self, requests):
+        job_request = next(requests, None)
+        self.pending_submission = job_request is not None
+        if self.pending_submission:
+            self.events.push(job_request.sub_time, Event.SUBMISSION, job_request)
+
+    def _process_events(self, time, requests):
+        while self.events and self.events.peek()[0] <= time:
+            _, event, payload = self.events.pop()
+            if event is Event.SUBMISSION:
+                self.scheduler.schedule(payload)
+                self._submit_next(requests)
+
+    def _next_event_time(self):
+        # Interrupted jobs leave behind events that will never happen.
+        while self.events:
+            time, event, payload = self.events.peek()
+            if event is Event.SUBMISSION or payload.end_time == time:
+                return time
+            self.events.pop()
+        return None
+
+    def _round(self, time):
+        if not self.time_step:
+            return time
+        return ceil(time / self.time_step) * self.time_step
+
+    def _on_job_start(self, job: Job):
+        self.events.push(job.end_time, Event.from_job(job), job)
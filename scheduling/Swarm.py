@@ -1,11 +1,22 @@
-from dataclasses import dataclass
-from random import seed
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import astuple, dataclass
+from functools import partial
+from itertools import repeat
+from math import inf
+from pathlib import Path
+from random import Random
 from statistics import mean, stdev
 
+import numpy as np
 import structlog
 
 from .Experiments import Experiments
 from .Particle import Particle
+from .PhaseMetrics import PhaseMetrics
+from .Population import Population
+from .Racing import Race
 from .Scheduler import SchedulerConfig
 
 
@@ -19,14 +30,16 @@ class EpochCost:
     max: float  #: The maximum calculated cost during the epoch.
     mean: float  #: The mean cost value of the epoch.
     std: float  #: The standard deviation of the calculated costs during the epoch.
+    saved_expts: int = 0  #: The number of experiments skipped by racing.
 
     @classmethod
-    def from_costs(cls, epoch: int, particles_cost: list):
+    def from_costs(cls, epoch: int, particles_cost: list, saved_expts=0):
         """Constructs an EpochCost object from a list of calculated costs.
 
         Args:
             epoch: The epoch identifier.
             particles_cost: A list of all the calculated costs during the epoch.
+            saved_expts: The number of experiments skipped by racing.
 
         Returns:
             EpochCost: An EpochCost object.
@@ -37,6 +50,7 @@ class EpochCost:
             max(particles_cost),
             mean(particles_cost),
             stdev(particles_cost),
+            saved_expts,
         )
 
     def to_dict(self):
@@ -50,11 +64,60 @@ class EpochCost:
         return dict_obj
 
 
+_worker_experiment = None  #: The Experiments object of a worker process.
+
+
+def _init_worker(experiment: Experiments):
+    """Initializes a worker process of a parallel Swarm.
+
+    Args:
+        experiment: The experimental environment of the Swarm.
+    """
+    global _worker_experiment
+    _worker_experiment = experiment
+
+
+def _run_particle_expts(
+    config: SchedulerConfig, num_srvs, num_expts, seed_num, keep_history, history_dir
+):
+    """Runs the experiments of one Particle in a worker process.
+
+    Args:
+        config: The configuration of the Particle.
+        num_srvs: The total number of servers.
+        num_expts: The number of experiements to be run.
+        seed_num: The seed of the first experiment.
+        keep_history: A flag for keeping the completed jobs in the statistics.
+        history_dir: The directory the kept completed jobs are streamed to.
+
+    Returns:
+        list: A list of scheduling statistics.
+    """
+    _worker_experiment.keep_history = keep_history
+    return _worker_experiment.run_expts(
+        config, num_srvs, num_expts, seed_num, history_dir=history_dir
+    )
+
+
 class Swarm(object):
     """An environment in which a population of Particles evolves.
     """
 
-    def __init__(self, seed_num: int, num_particles: int, num_srvs: int, num_exp=10):
+    CHECKPOINT_VERSION = 1  #: The version of the checkpoint format.
+
+    def __init__(
+        self,
+        seed_num: int,
+        num_particles: int,
+        num_srvs: int,
+        num_exp=10,
+        workload_cache=None,
+        num_workers=1,
+        racing=None,
+        evaluation_cache=None,
+        history_dir=None,
+        instrument=False,
+    ):
         """Creates a Swarm object.
 
         Args:
@@ -62,76 +125,361 @@ class Swarm(object):
             num_particles: The Particles count within the Swarm.
             num_srvs: The total servers count.
             num_exp: The total count of experiments.
+            workload_cache: A WorkloadCache shared by the experiments of all \
+            the Particles.
+            num_workers: The number of processes evaluating the Particles in \
+            parallel. The results do not depend on it.
+            racing: A RacingConfig for evaluating the Particles in a Race, \
+            dropping the dominated ones early. If None, every Particle runs all \
+            the experiments.
+            evaluation_cache: An EvaluationCache shared by the experiments of \
+            all the Particles, used when no Gantt chart is drawn.
+            history_dir: A directory the completed jobs drawn in the Gantt \
+            charts are streamed to, in the subdirectories \
+            epoch_{num_epoch}/particle_{i}/seed_{seed_num}. If None, they are \
+            kept in memory.
+            instrument: A flag for timing the phases of the Schedulers, the \
+            PhaseMetrics of every epoch are kept in epoch_metrics.
         """
         assert num_particles > 1, "The number of particles must be greater than 1"
-        seed(seed_num)
         self.seed = seed_num  #: The Experiments' seed.
-        self.population = [
-            Particle(SchedulerConfig.random()) for _ in range(num_particles)
-        ]  #: list of Particle objects: A container for the members of the the Swarm.
+        self.rng = Random(seed_num)
+        """random.Random: The generator of the initial and updated positions."""
+        self.population = Population.random(num_particles, self.rng)
+        """Population: The state of the members of the the Swarm."""
         self.num_srvs = num_srvs  #: The total servers count.
         self.num_exp = num_exp  #: The total count of experiments.
         self.best_particle = None
         """Particle: The Particle with lowest cost in the Swarm."""
-        self.experiment = Experiments()  #: Experiments: The experimental environment.
+        self.epoch_costs = []
+        """list of EpochCost objects: The costs of the epochs already run."""
+        self.experiment = Experiments(
+            workload_cache=workload_cache,
+            evaluation_cache=evaluation_cache,
+            history_dir=history_dir,
+            instrument=instrument,
+        )
+        """Experiments: The experimental environment."""
+        self.epoch_metrics = {}
+        """dict: The summed PhaseMetrics of the experiments of every epoch run \
+        instrumented, by epoch identifier. They are saved in the checkpoints."""
+        self.num_workers = num_workers
+        """The number of processes evaluating the Particles in parallel."""
+        self.racing = racing  #: RacingConfig: The settings of the racing evaluation.
+        self._pool = None  #: The pool of worker processes, while running epochs.
         self.logger = structlog.getLogger(__name__)  #: The Swarm's logger.
 
-    def run_epochs(self, num_epochs: int, stat_handler):
+    def run_epochs(self, num_epochs: int, stat_handler, checkpoint_path=None):
         """Runs the experiments for the specified number of epochs.
 
+        The epochs already run, for instance before load_checkpoint, are not run
+        again.
+
         Args:
             num_epochs: The epoch count to be run.
-            stat_handler: A method handler for injecting a drawing function \
-            (draw_stats).
+            stat_handler: A callable taking the epoch, the Particle identifier, \
+            the statistics of its experiments and whether it is the best of the \
+            epoch, an ArtifactPipeline for instance. If it has a \
+            samples_epoch(num_epoch) method, the experiments of the epochs it \
+            rejects do not keep their completed jobs.
+            checkpoint_path: The file the state of the Swarm is saved to after \
+            every epoch. If None, no checkpoint is saved.
 
         Returns:
             list: A list of EpochCost objects encapsulating all costs resulting \
             from each epochs runs.
         """
-        epochs_costs = []
-        for i in range(num_epochs):
-            self.logger.info("running epoch", epoch=f"{i+1}/{num_epochs}")
-            epoch_cost = self._run_epoch(i, stat_handler)
-            epochs_costs.append(epoch_cost)
-        return epochs_costs
+        if self.num_workers > 1:
+            self._pool = ProcessPoolExecutor(
+                self.num_workers, initializer=_init_worker, initargs=(self.experiment,)
+            )
+        try:
+            for i in range(len(self.epoch_costs), num_epochs):
+                self.logger.info("running epoch", epoch=f"{i+1}/{num_epochs}")
+                epoch_cost = self._run_epoch(i, stat_handler)
+                self.epoch_costs.append(epoch_cost)
+                if checkpoint_path is not None:
+                    self.save_checkpoint(checkpoint_path)
+            return list(self.epoch_costs)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
 
     def _run_epoch(self, num_epoch: int, stat_handler):
         """Runs the experiments for one epoch.
 
         Args:
             num_epoch: The epoch identifier.
-            stat_handler: A method handler for injecting a drawing function \
-            (draw_stats).
+            stat_handler: The handler of the statistics of the Particles.
 
         Returns:
             EpochCost: An EpochCost object encapsulating all costs resulting from the each run.
         """
-        particles_cost = []
-        best_cost = None
-        for i, particle in enumerate(self.population):
+        # The completed jobs are only needed for drawing the schedules.
+        keep_history = stat_handler is not None
+        if keep_history and hasattr(stat_handler, "samples_epoch"):
+            keep_history = stat_handler.samples_epoch(num_epoch)
+        self.experiment.keep_history = keep_history
+
+        if self.racing is None:
+            particles_stats, race = list(self._evaluate(num_epoch)), None
+        else:
+            particles_stats, race = self._race(num_epoch)
+
+        particles_cost = [
+            mean([stat.cost for stat in stats]) for stats in particles_stats
+        ]
+        if self.experiment.instrument:
+            metrics = PhaseMetrics.aggregate(
+                stat for stats in particles_stats for stat in stats
+            )
+            self.epoch_metrics[num_epoch] = metrics
+            self.logger.info("phase metrics", epoch=num_epoch + 1, **metrics.to_dict())
+
+        saved_expts = 0
+        contenders = particles_cost
+        if race is not None:
+            # The dropped Particles were evaluated on fewer experiments.
+            particles_cost = race.estimated_costs().tolist()
+            contenders = np.where(race.alive, particles_cost, inf)
+            saved_expts = len(self.population) * self.num_exp - sum(
+                len(stats) for stats in particles_stats
+            )
+            self.logger.info(
+                "raced particles",
+                dropped=int((~race.alive).sum()),
+                saved_expts=saved_expts,
+                epoch=num_epoch + 1,
+            )
+
+        self.best_particle = Particle(self.population, int(np.argmin(contenders)))
+        if stat_handler is not None:
+            for i, stats in enumerate(particles_stats):
+                stat_handler(num_epoch, i, stats, is_best=i == self.best_particle.index)
+        self.population.update_costs(particles_cost)
+        self.population.update_positions(self.best_particle.index, self.rng)
+
+        return EpochCost.from_costs(num_epoch, particles_cost, saved_expts)
+
+    def save_checkpoint(self, path):
+        """Saves the state of the Swarm after its last epoch.
+
+        The file is replaced atomically, an interrupted save leaves the previous
+        checkpoint intact.
+
+        Args:
+            path: The checkpoint file.
+        """
+        state = {
+            "version": Swarm.CHECKPOINT_VERSION,
+            "settings": self._settings(),
+            "rng_state": self.rng.getstate(),
+            "positions": self.population.positions,
+            "velocities": self.population.velocities,
+            "best_positions": self.population.best_positions,
+            "best_costs": self.population.best_costs,
+            "best_particle": self.best_particle.index,
+            "epoch_costs": [astuple(cost) for cost in self.epoch_costs],
+            "epoch_metrics": {
+                epoch: astuple(metrics) for epoch, metrics in self.epoch_metrics.items()
+            },
+        }
+        path = Path(path)
+        path.parent.mkdir(0o755, parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        self.logger.debug(
+            "saved checkpoint", epoch=len(self.epoch_costs), path=str(path)
+        )
+
+    def load_checkpoint(self, path):
+        """Restores the state of the Swarm saved by save_checkpoint.
+
+        Args:
+            path: The checkpoint file.
+
+        Raises:
+            ValueError: If the checkpoint was saved by a Swarm with other settings.
+        """
+        with open(path, "rb") as file:
+            state = pickle.load(file)
+        if state["version"] != Swarm.CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {state['version']}")
+        if state["settings"] != self._settings():
+            raise ValueError(
+                f"The checkpoint settings {state['settings']} do not match "
+                f"the swarm settings {self._settings()}"
+            )
+
+        self.rng.setstate(state["rng_state"])
+        self.population.positions = state["positions"]
+        self.population.velocities = state["velocities"]
+        self.population.best_positions = state["best_positions"]
+        self.population.best_costs = state["best_costs"]
+        self.best_particle = Particle(self.population, state["best_particle"])
+        self.epoch_costs = [EpochCost(*cost) for cost in state["epoch_costs"]]
+        # The checkpoints saved before the metrics were kept have none.
+        self.epoch_metrics = {
+            epoch: PhaseMetrics(*metrics)
+            for epoch, metrics in state.get("epoch_metrics", {}).items()
+        }
+        self.logger.info("resuming", epoch=len(self.epoch_costs), path=str(path))
+
+    def _settings(self):
+        return {
+            "seed": self.seed,
+            "particles": len(self.population),
+            "servers": self.num_srvs,
+            "experiments": self.num_exp,
+            "racing": None if self.racing is None else astuple(self.racing),
+        }
+
+    def _evaluate(self, num_epoch: int):
+        """Runs the experiments of every Particle of the population.
+
+        The Particles are evaluated in the worker processes when there are some,\
+        only their configuration and their statistics are then exchanged.
+
+        Args:
+            num_epoch: The epoch identifier.
+
+        Returns:
+            iterator: The lists of statistics of the Particles, in population order.
+        """
+        configs = self.population.configs()
+        if self._pool is not None:
             self.logger.info(
                 "running experiments",
-                particle=f"{i+1}/{len(self.population)}",
+                particles=len(self.population),
+                workers=self.num_workers,
                 epoch=num_epoch + 1,
             )
-            stats = self.experiment.run_expts(
-                particle.config,
-                num_srvs=self.num_srvs,
-                num_expts=self.num_exp,
-                seed_num=num_epoch,
+            return self._pool.map(
+                _run_particle_expts,
+                configs,
+                repeat(self.num_srvs),
+                repeat(self.num_exp),
+                repeat(num_epoch),
+                repeat(self.experiment.keep_history),
+                map(partial(self._history_dir, num_epoch), range(len(configs))),
             )
+        return (
+            self._run_particle(i, config, num_epoch)
+            for i, config in enumerate(configs)
+        )
 
-            if stat_handler is not None:
-                stat_handler(num_epoch, i, stats)
+    def _race(self, num_epoch: int):
+        """Runs the experiments of the population as a Race.
 
-            cost = mean([stat.cost for stat in stats])
-            particles_cost.append(cost)
-            if best_cost is None or cost < best_cost:
-                best_cost = cost
-                self.best_particle = particle
-            particle.update_cost(cost)
+        The Particle that was the best in the previous epoch runs all the
+        experiments first. The rounds then run the other Particles still in the
+        Race, starting with the experiments it found the most costly since they
+        weigh the most in the mean costs. Every Particle runs the experiments it
+        would have run without racing.
 
-        for particle in self.population:
-            particle.update_position(self.best_particle.config)
+        Args:
+            num_epoch: The epoch identifier.
+
+        Returns:
+            tuple: The lists of statistics of the Particles, in population and \
+            seed order, and the finished Race.
+        """
+        configs = self.population.configs()
+        seeds = range(num_epoch, num_epoch + self.num_exp)
+        reference = 0 if self.best_particle is None else self.best_particle.index
+        self.logger.info(
+            "running experiments", particle=reference + 1, epoch=num_epoch + 1
+        )
+        particles_stats = [{} for _ in configs]
+        particles_stats[reference] = dict(
+            enumerate(
+                self._run_round(
+                    [configs[reference]] * self.num_exp,
+                    seeds,
+                    repeat(self._history_dir(num_epoch, reference)),
+                )
+            )
+        )
+        order = sorted(
+            range(self.num_exp), key=lambda expt: -particles_stats[reference][expt].cost
+        )
+
+        race = Race(len(configs), self.num_exp, self.racing)
+        for num_round, expt in enumerate(order):
+            challengers = [i for i in np.flatnonzero(race.alive) if i != reference]
+            self.logger.info(
+                "running experiments",
+                particles=len(challengers),
+                round=f"{num_round+1}/{self.num_exp}",
+                epoch=num_epoch + 1,
+            )
+            round_stats = self._run_round(
+                [configs[i] for i in challengers],
+                repeat(seeds[expt]),
+                [self._history_dir(num_epoch, i) for i in challengers],
+            )
+            for i, stats in zip(challengers, round_stats):
+                particles_stats[i][expt] = stats
+            dropped = race.record(
+                [particles_stats[i][expt].cost for i in np.flatnonzero(race.alive)]
+            )
+            if len(dropped):
+                self.logger.debug("dropped particles", particles=dropped.tolist())
+        return [[stats[e] for e in sorted(stats)] for stats in particles_stats], race
+
+    def _run_round(self, configs: list, seeds, history_dirs):
+        """Runs one experiment for each configuration.
+
+        Args:
+            configs: The configurations of the Particles.
+            seeds: The seed of the experiment of each configuration.
+            history_dirs: The directory the kept completed jobs of each \
+            configuration are streamed to.
+
+        Returns:
+            iterator: The statistics of the experiments, in configuration order.
+        """
+        if self._pool is not None:
+            stats = self._pool.map(
+                _run_particle_expts,
+                configs,
+                repeat(self.num_srvs),
+                repeat(1),
+                seeds,
+                repeat(self.experiment.keep_history),
+                history_dirs,
+            )
+        else:
+            stats = (
+                self.experiment.run_expts(
+                    config, self.num_srvs, 1, seed_num, history_dir=history_dir
+                )
+                for config, seed_num, history_dir in zip(configs, seeds, history_dirs)
+            )
+        return [expt_stats[0] for expt_stats in stats]
+
+    def _run_particle(self, i: int, config: SchedulerConfig, num_epoch: int):
+        self.logger.info(
+            "running experiments",
+            particle=f"{i+1}/{len(self.population)}",
+            epoch=num_epoch + 1,
+        )
+        return self.experiment.run_expts(
+            config,
+            num_srvs=self.num_srvs,
+            num_expts=self.num_exp,
+            seed_num=num_epoch,
+            history_dir=self._history_dir(num_epoch, i),
+        )
 
-        return EpochCost.from_costs(num_epoch, particles_cost)
+    def _history_dir(self, num_epoch: int, i: int):
+        # Every Particle of an epoch streams its completed jobs to a directory of
+        # its own, the same one when the epoch is run again.
+        if self.experiment.history_dir is None:
+            return None
+        return f"{self.experiment.history_dir}/epoch_{num_epoch}/particle_{i}"
@@ -0,0 +1,229 @@
+import os
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from .Workload import Workload
+
+logger = structlog.getLogger(__name__)
+
+
+@dataclass
+class TraceRules:
+    """The rules mapping the records of a trace to JobRequests.
+
+    The servers of a job are its processors divided by the processors of a
+    server. Its mass is the one that gives the run time of the trace on its
+    allocated servers.
+    """
+
+    server_count: int  #: The total number of servers of the simulated cluster.
+    cores_per_server: int = 1  #: The number of processors of a server.
+    alpha: object = (0.5, 1)
+    """The speedup factor of the jobs, a value or the (low, high) bounds of a \
+    uniform distribution."""
+    data: float = 100  #: The amount of data of a job without memory information.
+    data_per_mb: float = 0
+    """The amount of data per MB of used memory, 0 ignores the used memory."""
+    max_server_factor: float = 2
+    """The ratio of the maximum to the minimum number of servers of a job."""
+    seed: int = 0  #: The seed of the drawn speedup factors.
+
+
+class SwfTrace:
+    """A workload trace in the Standard Workload Format of the Parallel Workloads \
+    Archive.
+
+    The trace is read in chunks and converted into JobRequests lazily, so that the
+    memory stays flat on long traces. The records without run time or processors,
+    cancelled jobs for instance, are skipped. The records must be ordered by
+    submission time, as in the archive. The converted rows can be cached as .npy
+    files in the layout of Workload, later runs then memory-map them instead of
+    parsing the trace.
+    """
+
+    VERSION = 1  #: The version of the conversion, part of the keys of the cache.
+    CHUNK_SIZE = 65536  #: The number of records parsed at once.
+    FIELDS = {
+        "job_number": 0,
+        "submit_time": 1,
+        "run_time": 3,
+        "allocated_processors": 4,
+        "used_memory": 6,
+        "requested_processors": 7,
+    }  #: The columns of the SWF fields used by the conversion.
+
+    def __init__(self, path, rules: TraceRules, cache_dir=None):
+        """Creates an SwfTrace object.
+
+        Args:
+            path: The trace file, possibly compressed.
+            rules: The rules mapping the records to JobRequests.
+            cache_dir: The directory holding the converted traces. If None, the \
+            trace is parsed on every run.
+
+        """
+        self.path = Path(path)  #: pathlib.Path: The trace file.
+        self.rules = rules  #: TraceRules: The rules mapping the records.
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        """pathlib.Path: The directory holding the converted traces."""
+
+    def requests(self):
+        """Converts the records of the trace into JobRequests, lazily.
+
+        The identifiers are "job" followed by the index of the kept record.
+
+        Returns:
+            generator: The JobRequest objects, ordered by submission time.
+        """
+        if self.cache_dir is not None:
+            yield from Workload(self._cached_jobs()).requests()
+            return
+
+        first_index = 0
+        for jobs in self.chunks():
+            yield from Workload(jobs, first_index).requests()
+            first_index += len(jobs)
+
+    def chunks(self):
+        """Parses the trace into chunks of rows.
+
+        Returns:
+            generator: Structured arrays of Workload.DTYPE.
+
+        Raises:
+            ValueError: If the records are not ordered by submission time.
+        """
+        rng = np.random.default_rng(self.rules.seed)
+        last_sub_time = -np.inf
+        records = pd.read_csv(
+            self.path,
+            sep=r"\s+",
+            comment=";",
+            header=None,
+            usecols=list(SwfTrace.FIELDS.values()),
+            names=list(SwfTrace.FIELDS),
+            dtype=np.float64,
+            chunksize=SwfTrace.CHUNK_SIZE,
+        )
+        for chunk in records:
+            jobs = self._convert(chunk, rng)
+            if not len(jobs):
+                continue
+            sub_times = jobs["sub_time"]
+            if sub_times[0] < last_sub_time or np.any(np.diff(sub_times) < 0):
+                raise ValueError(f"{self.path} is not ordered by submission time")
+            last_sub_time = sub_times[-1]
+            yield jobs
+
+    def _convert(self, chunk: pd.DataFrame, rng):
+        rules = self.rules
+        requested = chunk["requested_processors"].to_numpy()
+        allocated = chunk["allocated_processors"].to_numpy()
+        # Missing values are -1 in SWF.
+        requested = np.where(requested > 0, requested, allocated)
+        allocated = np.where(allocated > 0, allocated, requested)
+        run_time = chunk["run_time"].to_numpy()
+        kept = (run_time > 0) & (allocated > 0)
+        if not kept.all():
+            requested, allocated, run_time = (
+                requested[kept],
+                allocated[kept],
+                run_time[kept],
+            )
+            chunk = chunk[kept]
+
+        jobs = np.empty(len(run_time), dtype=Workload.DTYPE)
+        jobs["sub_time"] = chunk["submit_time"].to_numpy()
+        if np.ndim(rules.alpha):
+            jobs["alpha"] = rng.uniform(*rules.alpha, len(jobs))
+        else:
+            jobs["alpha"] = rules.alpha
+
+        used_memory = chunk["used_memory"].to_numpy()
+        jobs["data"] = rules.data
+        if rules.data_per_mb:
+            # The used memory is in KB per processor.
+            known = used_memory > 0
+            jobs["data"][known] = (
+                used_memory[known] / 1024 * allocated[known] * rules.data_per_mb
+            )
+
+        def to_servers(processors):
+            servers = np.ceil(processors / rules.cores_per_server)
+            return np.clip(servers, 1, rules.server_count)
+
+        allocated_servers = to_servers(allocated)
+        jobs["min_num_servers"] = to_servers(requested)
+        jobs["max_num_servers"] = np.clip(
+            np.ceil(jobs["min_num_servers"] * rules.max_server_factor),
+            jobs["min_num_servers"],
+            rules.server_count,
+        )
+        # Job.exec_time(mass, servers, alpha) gives back the run time of the trace.
+        jobs["mass"] = run_time * allocated_servers ** jobs["alpha"]
+        return jobs
+
+    def key(self):
+        """Computes the key of the converted trace.
+
+        Returns:
+            str: A hexadecimal digest of the trace file and of the rules.
+        """
+        stat = self.path.stat()
+        content = repr(
+            (
+                SwfTrace.VERSION,
+                str(self.path.resolve()),
+                stat.st_size,
+                stat.st_mtime_ns,
+                sorted(asdict(self.rules).items()),
+            )
+        )
+        return sha256(content.encode()).hexdigest()[:32]
+
+    def _cached_jobs(self):
+        path = self.cache_dir / f"{self.path.stem}-{self.key()}.npy"
+        if not path.exists():
+            self._store(path)
+        else:
+            logger.debug("Loading cached trace.", path=str(path))
+        return np.load(path, mmap_mode="r")
+
+    def _store(self, path):
+        self.cache_dir.mkdir(0o755, parents=True, exist_ok=True)
+        # The rows are appended to a raw file, then copied into a .npy file of the
+        # final size, so that the memory stays flat.
+        raw_path = self.cache_dir / f".{path.stem}.{os.getpid()}.raw"
+        tmp_path = self.cache_dir / f".{path.stem}.{os.getpid()}.tmp.npy"
+        job_count = 0
+        try:
+            with open(raw_path, "wb") as raw_file:
+                for jobs in self.chunks():
+                    raw_file.write(jobs.tobytes())
+                    job_count += len(jobs)
+
+            jobs = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=Workload.DTYPE, shape=(job_count,)
+            )
+            if job_count:
+                raw = np.memmap(raw_path, dtype=Workload.DTYPE, mode="r")
+                for start in range(0, job_count, SwfTrace.CHUNK_SIZE):
+                    end = start + SwfTrace.CHUNK_SIZE
+                    jobs[start:end] = raw[start:end]
+                del raw
+            jobs.flush()
+            del jobs
+            os.replace(tmp_path, path)
+        finally:
+            # Path.unlink(missing_ok=True) needs Python 3.8.
+            for leftover_path in (raw_path, tmp_path):
+                try:
+                    leftover_path.unlink()
+                except FileNotFoundError:
+                    pass
+        logger.info("Cached converted trace.", path=str(path), jobs=job_count)
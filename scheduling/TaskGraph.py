@@ -0,0 +1,136 @@
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import structlog
+
+logger = structlog.getLogger(__name__)
+
+
+@dataclass
+class Task:
+    """A node of a TaskGraph.
+
+    The task calls fn(*args, *results) where results are the results of its
+    dependencies, in order. A task producing files is up to date when all its
+    outputs exist and are newer than all its existing inputs.
+    """
+
+    name: str  #: The task identifier.
+    fn: object  #: The function run by the task, picklable for process executors.
+    args: tuple = ()  #: The first arguments passed to fn.
+    deps: list = field(default_factory=list)  #: The names of the dependencies.
+    outputs: list = field(default_factory=list)  #: The files produced by the task.
+    inputs: list = field(default_factory=list)  #: The files the outputs depend on.
+
+    def is_up_to_date(self):
+        """Checks whether the outputs of the task are up to date.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        outputs = [Path(output) for output in self.outputs]
+        if not outputs or not all(output.exists() for output in outputs):
+            return False
+        inputs = [Path(input) for input in self.inputs if Path(input).exists()]
+        if not inputs:
+            return True
+        oldest_output = min(output.stat().st_mtime for output in outputs)
+        return oldest_output >= max(input.stat().st_mtime for input in inputs)
+
+
+class TaskGraph:
+    """A directed acyclic graph of tasks run concurrently on an executor.
+
+    A task is submitted as soon as all its dependencies are done, so that
+    independent chains of tasks overlap. Tasks are skipped when their outputs are
+    up to date and no task that still has to run depends on them.
+    """
+
+    def __init__(self):
+        """Creates an empty TaskGraph object."""
+        self.tasks = {}  #: The tasks of the graph, by name.
+
+    def add(self, name: str, fn, args=(), deps=(), outputs=(), inputs=()):
+        """Adds a task to the graph.
+
+        Args:
+            name: The task identifier.
+            fn: The function run by the task.
+            args: The first arguments passed to fn.
+            deps: The names of the tasks whose results are passed to fn.
+            outputs: The files produced by the task.
+            inputs: The files the outputs depend on.
+
+        Returns:
+            str: The name of the task.
+        """
+        assert name not in self.tasks, f"Task {name} already exists"
+        assert all(dep in self.tasks for dep in deps), f"Unknown dependency of {name}"
+        self.tasks[name] = Task(name, fn, tuple(args), list(deps), outputs, inputs)
+        return name
+
+    def run(self, executor):
+        """Runs the tasks of the graph that are not up to date.
+
+        Args:
+            executor: An executor from make_executor.
+
+        Returns:
+            dict: The results of the tasks that ran, by name. A result is \
+            released once all the tasks depending on it are done.
+        """
+        skipped = self._skipped_tasks()
+        for name in skipped:
+            logger.debug("Up to date, skipping.", task=name)
+        pending = {
+            name: task for name, task in self.tasks.items() if name not in skipped
+        }
+        remaining_uses = {name: 0 for name in pending}
+        for task in pending.values():
+            for dep in task.deps:
+                remaining_uses[dep] += 1
+
+        results = {}
+        running = {}
+        while pending or running:
+            for name, task in list(pending.items()):
+                if all(dep in results for dep in task.deps):
+                    dep_results = [results[dep] for dep in task.deps]
+                    future = executor.submit(task.fn, *task.args, *dep_results)
+                    running[future] = name
+                    del pending[name]
+
+            assert running, "Tasks are waiting for skipped dependencies"
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                logger.debug("Done.", task=name)
+                for dep in self.tasks[name].deps:
+                    remaining_uses[dep] -= 1
+                    if remaining_uses[dep] == 0:
+                        del results[dep]
+        return results
+
+    def _dependents(self):
+        dependents = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for dep in task.deps:
+                dependents[dep].append(task.name)
+        return dependents
+
+    def _skipped_tasks(self):
+        dependents = self._dependents()
+        skipped = set()
+        # Tasks are added after their dependencies, dependents come first reversed.
+        for name in reversed(list(self.tasks)):
+            task = self.tasks[name]
+            if not all(dependent in skipped for dependent in dependents[name]):
+                continue
+            if task.outputs:
+                if task.is_up_to_date():
+                    skipped.add(name)
+            elif dependents[name]:
+                skipped.add(name)
+        return skipped
@@ -1,78 +1,180 @@
-from dataclasses import astuple, dataclass
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from pathlib import Path
-from random import uniform
+from threading import Lock
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import structlog
+from matplotlib import path as mpath
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
 
+from .JobHistory import JobHistory
+from .JobLog import JobLog
 from .Scheduler import SchedulerStats
 
 
-@dataclass
-class Vector2i:
-    """A 2-dimensional vector of int."""
-
-    x: int = 0  #: value on the x axis.
-    y: int = 0  #: value on the y axis.
+logger = structlog.getLogger(__name__)
 
+GANTT_PALETTE_SIZE = 64  #: The number of colors of the jobs in the Gantt charts.
+_RECTANGLE_CODES = (
+    [mpath.Path.MOVETO] + [mpath.Path.LINETO] * 3 + [mpath.Path.CLOSEPOLY]
+)  #: The path codes of a rectangle.
 
-@dataclass
-class Color:
-    """A color container object.
 
-    Default color is black.
-    """
+def render_gantt(history, filepath: str):
+    """Renders the Gantt chart of completed jobs to an image file.
 
-    r: float = 0  #: Normalized red channel value.
-    g: float = 0  #: Normalized green channel value.
-    b: float = 0  #: Normalized blue channel value.
-    a: float = 1  #: Normalized alpha value (influences the transparency).
+    The chart is built with the object-oriented API of matplotlib on an Agg canvas,
+    without the global state of pyplot, so that charts can be rendered
+    concurrently in threads or processes. The rectangles sharing a color are
+    merged into one compound path, and all the paths are drawn by a single
+    PathCollection.
 
-
-logger = structlog.getLogger(__name__)
+    Args:
+        history: The JobHistory or JobLog of the completed jobs.
+        filepath: The location for writing the resulting Gantt chart.
+    """
+    if isinstance(history, JobLog):
+        history = history.read()
+    columns = history.columns()
+    jobs, first_servers, server_counts = history.server_runs()
+    start_times = columns["start_times"][jobs]
+    end_times = columns["end_times"][jobs]
+
+    # Every JobRequest gets a random color of the palette, its reconfigurations
+    # are half transparent. Power-offs are black.
+    rng = np.random.default_rng()
+    palette = np.ones((2 * GANTT_PALETTE_SIZE + 1, 4))
+    palette[:GANTT_PALETTE_SIZE, :3] = rng.uniform(0.25, 0.9, (GANTT_PALETTE_SIZE, 3))
+    palette[GANTT_PALETTE_SIZE:-1] = palette[:GANTT_PALETTE_SIZE]
+    palette[GANTT_PALETTE_SIZE:-1, 3] = 0.5
+    palette[-1] = (0, 0, 0, 1)
+    id_colors = rng.integers(GANTT_PALETTE_SIZE, size=len(history.ids))
+    kinds = columns["kinds"][jobs]
+    colors = id_colors[columns["job_ids"][jobs]]
+    colors[kinds == JobHistory.Kind.RECONFIGURATION] += GANTT_PALETTE_SIZE
+    colors[kinds == JobHistory.Kind.POWER_OFF] = len(palette) - 1
+
+    order = np.argsort(colors, kind="stable")
+    x0, x1 = start_times[order], end_times[order]
+    y0 = first_servers[order]
+    y1 = y0 + server_counts[order]
+    vertices = np.stack([x0, y0, x0, y1, x1, y1, x1, y0, x0, y0], axis=1)
+    used_colors, counts = np.unique(colors[order], return_counts=True)
+    paths = [
+        mpath.Path(
+            rectangles.reshape(-1, 2), np.tile(_RECTANGLE_CODES, len(rectangles))
+        )
+        for rectangles in np.split(vertices, np.cumsum(counts)[:-1])
+    ]
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    ax = figure.subplots()
+    ax.add_collection(
+        PathCollection(
+            paths,
+            facecolors=palette[used_colors],
+            edgecolors="none",
+            linewidths=0,
+            # Rectangles narrower than a pixel are drawn, as single patches are.
+            snap=True,
+        ),
+        autolim=False,
+    )
+    if len(vertices):
+        ax.update_datalim([(x0.min(), y0.min()), (x1.max(), y1.max())])
+    ax.autoscale_view()
+    ax.set_ylabel("servers")
+    ax.set_xlabel("time")
+    figure.savefig(filepath, dpi=200)
 
 
 class Visualizer:
     """A class that creates different types of visualizations.
     """
 
+    def __init__(self, num_workers=0):
+        """Creates a Visualizer object.
+
+        Args:
+            num_workers: The number of processes rendering the Gantt charts in \
+            the background. If 0, they are rendered by the calling thread.
+
+        """
+        self.num_workers = num_workers
+        """The number of processes rendering the Gantt charts in the background."""
+        self._pool = None  #: The pool rendering the Gantt charts, created lazily.
+        self._pending = []  #: The futures of the charts being rendered.
+        self._lock = Lock()  #: Guards the pool and the futures across threads.
+
+    def __getstate__(self):
+        # The copies sent to other processes render in their calling thread.
+        state = self.__dict__.copy()
+        state.update(num_workers=0, _pool=None, _pending=[])
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
     def draw_gantt(self, stats: SchedulerStats, filepath: str):
         """Draws a Gantt chart.
 
-        Directories referenced by filepath are created similar to mkdir -p.
+        Directories referenced by filepath are created similar to mkdir -p. With \
+        background workers, the chart is rendered asynchronously and the rendering \
+        errors are raised by wait.
 
         Args:
             stats (SchedulerStats): A container object for the scheduler's \
             output statistics.
             filepath (str): The location for writing the resulting Gantt chart.
 
+        Returns:
+            concurrent.futures.Future: The future of the rendering, None if the \
+            chart was rendered by the calling thread.
         """
         path = Path(filepath)
         path.parent.mkdir(0o755, parents=True, exist_ok=True)
+        if not self.num_workers:
+            render_gantt(stats.complete_jobs, filepath)
+            return None
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    self.num_workers, mp_context=get_context("spawn")
+                )
+            self._pending = [future for future in self._pending if not future.done()]
+            future = self._pool.submit(render_gantt, stats.complete_jobs, filepath)
+            self._pending.append(future)
+        return future
+
+    def wait(self):
+        """Waits for the Gantt charts rendered in the background.
 
-        plt.figure(filepath)
-        plt.subplot()
-
-        power_off_color = Color(0, 0, 0)
-        for jobs in stats.complete_jobs.values():
-            job_color = Color(
-                uniform(0.25, 0.9), uniform(0.25, 0.9), uniform(0.25, 0.9)
-            )
-            for job in jobs:
-                job_color.a = 0.5 if job.is_reconfiguration() else 1
-                if job.is_power_off():
-                    job_color = power_off_color
-                for server in job.servers:
-                    tl = Vector2i(job.start_time, server.index)
-                    size = Vector2i(job.duration, 1)
-                    self._draw_rectangle(tl=tl, size=size, color=job_color)
-
-        plt.ylabel("servers")
-        plt.xlabel("time")
-        plt.axis("auto")
-        plt.savefig(filepath, dpi=200)
-        plt.close(filepath)
+        Raises:
+            Exception: The first error raised while rendering a chart.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self):
+        """Waits for the Gantt charts rendered in the background and stops the \
+        workers."""
+        try:
+            self.wait()
+        finally:
+            with self._lock:
+                pool, self._pool = self._pool, None
+            if pool is not None:
+                pool.shutdown()
 
     def draw_graph(self, stats, filepath: str, show_range=False):
         """Draws a 2D graph of the mean cost against the epoch count.
@@ -88,7 +190,9 @@ class Visualizer:
         """
         path = Path(filepath)
         path.parent.mkdir(0o755, parents=True, exist_ok=True)
-        fig, ax = plt.subplots(1)
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.subplots(1)
         if "epoch" in stats:
             # Drawing results of swarm training.
             xlabel = "Epoch"
@@ -110,7 +214,7 @@ class Visualizer:
         ax.legend(loc="upper right")
         ax.set_xlabel(xlabel)
         ax.set_ylabel(ylabel)
-        plt.savefig(filepath, dpi=200)
+        fig.savefig(filepath, dpi=200)
 
     def to_csv(self, table: list, path: str):
         """Converts a list into a csv file.
@@ -129,7 +233,3 @@ class Visualizer:
             f"Obtained costs, stored in {path.name}:\n{df_table}", name=path.name
         )
         df_table.to_csv(path)
-
-    def _draw_rectangle(self, tl, size, color):
-        rectangle = plt.Rectangle((tl.x, tl.y), size.x, size.y, fc=astuple(color))
-        plt.gca().add_patch(rectangle)
@@ -0,0 +1,103 @@
+from math import log, sqrt
+
+import numpy as np
+
+from .JobRequest import JobRequest
+
+
+class Workload:
+    """A set of JobRequests stored as a NumPy structured array.
+
+    Each row holds the attributes of a JobRequest but its identifier, which is
+    derived from the position of the row: "job" followed by the row index.
+    """
+
+    DTYPE = np.dtype(
+        [
+            ("sub_time", "f8"),
+            ("alpha", "f8"),
+            ("data", "f8"),
+            ("mass", "f8"),
+            ("min_num_servers", "i4"),
+            ("max_num_servers", "i4"),
+        ]
+    )  #: The layout of a row of the workload.
+
+    DYNAMISM = 500  #: The scale of the inter-arrival times.
+    MASS = 1700  #: The typical amount of calculations of a job.
+    DISPARITY = 3.8  #: The disparity of the amount of calculations of the jobs.
+    CHUNK_SIZE = 4096  #: The number of rows converted at once into JobRequests.
+
+    def __init__(self, jobs: np.ndarray, first_index=0):
+        """Creates a Workload object.
+
+        Args:
+            jobs: A structured array of Workload.DTYPE, ordered by submission time.
+            first_index: The index of the first row, used for the identifiers.
+
+        """
+        self.jobs = jobs  #: The structured array holding the jobs.
+        self.first_index = first_index  #: The index of the first row.
+
+    def __len__(self):
+        return len(self.jobs)
+
+    @classmethod
+    def generate(
+        cls,
+        job_count: int,
+        server_count: int,
+        seed_num: int,
+        dynamism=DYNAMISM,
+        mass=MASS,
+        disparity=DISPARITY,
+    ):
+        """Generates a Google-like workload.
+
+        All the attributes are drawn at once from a numpy.random.Generator seeded \
+        with seed_num, the generated workload is thus deterministic per seed.
+
+        Inter-arrival times follow a Lomax (Pareto II) distribution of shape 4 \
+        and scale 3 * dynamism.\n
+        Masses follow a log-normal distribution of median mass / disparity.\n
+        alpha: is sampled from a Uniform distribution (0.5, 1).\n
+        data: is sampled from a Uniform distribution (10, 500).\n
+        min_num_servers: is ceil(alpha / 3 * (server_count - 1)).\n
+        max_num_servers: is sampled uniformly in [min_num_servers, server_count).\n
+
+        Args:
+            job_count: The number of jobs to be generated.
+            server_count: The total number of servers.
+            seed_num: The seed of the generator.
+            dynamism: The scale of the inter-arrival times.
+            mass: The typical amount of calculations of a job.
+            disparity: The disparity of the amount of calculations of the jobs.
+
+        Returns:
+            Workload: The generated Workload.
+        """
+        rng = np.random.default_rng(seed_num)
+        mu = log(mass / disparity)
+        sigma = sqrt(2 * (log(mass) - mu))
+
+        jobs = np.empty(job_count, dtype=cls.DTYPE)
+        jobs["sub_time"] = np.cumsum(rng.pareto(4, job_count) * 3 * dynamism)
+        jobs["mass"] = rng.lognormal(mu, sigma, job_count)
+        jobs["alpha"] = rng.uniform(0.5, 1, job_count)
+        jobs["data"] = rng.uniform(10, 500, job_count)
+        jobs["min_num_servers"] = np.ceil(jobs["alpha"] / 3 * (server_count - 1))
+        jobs["max_num_servers"] = rng.integers(
+            jobs["min_num_servers"], server_count
+        )
+        return cls(jobs)
+
+    def requests(self):
+        """Converts the rows of the workload into JobRequests, lazily.
+
+        Returns:
+            generator: The JobRequest objects, ordered by submission time.
+        """
+        for start in range(0, len(self.jobs), Workload.CHUNK_SIZE):
+            rows = self.jobs[start : start + Workload.CHUNK_SIZE].tolist()
+            for i, row in enumerate(rows, start=self.first_index + start):
+                yield JobRequest("job" + str(i), *row)
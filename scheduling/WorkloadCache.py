@@ -0,0 +1,170 @@
+import os
+import threading
+from collections import OrderedDict
+from hashlib import sha256
+from pathlib import Path
+from tempfile import mkstemp
+
+import numpy as np
+import structlog
+
+from .Workload import Workload
+
+logger = structlog.getLogger(__name__)
+
+
+def sources_digest(names):
+    """Hashes the sources of modules of the package.
+
+    Args:
+        names: The file names of the modules.
+
+    Returns:
+        str: A hexadecimal digest of the sources.
+    """
+    digest = sha256()
+    for name in names:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class WorkloadCache:
+    """A content-addressed cache of generated Workloads.
+
+    Workloads are keyed by a hash of the generator parameters, the seed, the job
+    count and the server count. The most recently used ones are kept in memory,
+    and every generated Workload is also written to disk as a .npy file that is
+    later memory-mapped, so that other processes and later runs load it instead
+    of generating it again. A cache is shared by the threads of a process.
+    """
+
+    VERSION = sources_digest(["Workload.py"])
+    """The version of the workload generator, a digest of its sources part of the \
+    keys of the cache."""
+
+    def __init__(self, directory=None, capacity=64):
+        """Creates a WorkloadCache object.
+
+        Args:
+            directory: The directory holding the cached workloads. If None, \
+            the workloads are only cached in memory.
+            capacity: The maximum number of workloads kept in memory.
+
+        """
+        self.directory = None if directory is None else Path(directory)
+        """pathlib.Path: The directory holding the cached workloads."""
+        self.capacity = capacity  #: The maximum number of workloads kept in memory.
+        self._workloads = OrderedDict()  #: The workloads kept in memory, by key.
+        self.hits = 0  #: The number of workloads found in memory or on disk.
+        self.misses = 0  #: The number of workloads that had to be generated.
+        self._lock = threading.Lock()  #: Guards the workloads and the counters.
+
+    def __getstate__(self):
+        # Only the settings of the cache are sent to other processes.
+        state = self.__dict__.copy()
+        state["_workloads"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._workloads)
+
+    @staticmethod
+    def key(job_count: int, server_count: int, seed_num: int, **params):
+        """Computes the key of a generated workload.
+
+        Args:
+            job_count: The number of jobs of the workload.
+            server_count: The total number of servers.
+            seed_num: The seed of the generator.
+            **params: The parameters of the generator, defaults to the ones \
+            of Workload.generate.
+
+        Returns:
+            str: A hexadecimal digest identifying the workload.
+        """
+        params = {
+            "dynamism": Workload.DYNAMISM,
+            "mass": Workload.MASS,
+            "disparity": Workload.DISPARITY,
+            **params,
+        }
+        content = repr(
+            (
+                WorkloadCache.VERSION,
+                job_count,
+                server_count,
+                seed_num,
+                sorted(params.items()),
+            )
+        )
+        return sha256(content.encode()).hexdigest()[:32]
+
+    def get(self, job_count: int, server_count: int, seed_num: int, **params):
+        """Gives a generated workload, generating it only if it is not cached.
+
+        Args:
+            job_count: The number of jobs of the workload.
+            server_count: The total number of servers.
+            seed_num: The seed of the generator.
+            **params: The parameters passed to Workload.generate.
+
+        Returns:
+            Workload: The requested Workload.
+        """
+        key = self.key(job_count, server_count, seed_num, **params)
+        with self._lock:
+            workload = self._workloads.get(key)
+            if workload is not None:
+                self._workloads.move_to_end(key)
+                self.hits += 1
+                return workload
+
+        # Threads missing the same workload both generate it, without the lock.
+        workload = self._load(key)
+        generated = workload is None
+        if generated:
+            workload = Workload.generate(job_count, server_count, seed_num, **params)
+            self._store(key, workload)
+
+        with self._lock:
+            if generated:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._workloads[key] = workload
+            if len(self._workloads) > self.capacity:
+                self._workloads.popitem(last=False)
+        return workload
+
+    def _path(self, key):
+        return self.directory / f"{key}.npy"
+
+    def _load(self, key):
+        if self.directory is None or not self._path(key).exists():
+            return None
+        try:
+            jobs = np.load(self._path(key), mmap_mode="r")
+        except (OSError, ValueError):
+            logger.warning("Discarding unreadable cached workload.", key=key)
+            return None
+        return Workload(jobs)
+
+    def _store(self, key, workload):
+        if self.directory is None:
+            return
+        self.directory.mkdir(0o755, parents=True, exist_ok=True)
+        # Written under a name unique to the process and the thread then renamed,
+        # concurrent writers are safe.
+        fd, tmp_path = mkstemp(prefix=f".{key}.", suffix=".tmp.npy", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.save(file, workload.jobs)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
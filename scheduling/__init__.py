@@ -1,48 +1,94 @@
 import argparse
+import json
 import os
 
 import pandas as pd
 import structlog
 import yaml
 
+from .ArtifactPipeline import (
+    ArtifactPipeline,
+    CostGraphHandler,
+    CsvHandler,
+    GanttHandler,
+    SamplingPolicy,
+    log_summary,
+)
+from .EvaluationCache import EvaluationCache
 from .ExperimentsTest import run_all_experiments
 from .Logging import init as init_logging
+from .Experiments import Experiments
+from .PerfSuite import compare_perf_history, run_perf_suite
+from .PhaseMetrics import PhaseMetrics
+from .Racing import RacingConfig
+from .ScalingBenchmark import run_scaling_benchmark
+from .ScheduleViewer import export_schedule
+from .Scheduler import SchedulerConfig
+from .SwfTrace import SwfTrace, TraceRules
 from .Swarm import Swarm
 from .Visualizer import Visualizer
+from .WorkloadCache import WorkloadCache
 
 RESULT_DIR = f"./results/swarm_training/seed_"
 
 logger = structlog.getLogger(__name__)
 
 
-def run_swarm(visualizer: Visualizer, config: dict):
+def make_artifact_pipeline(visualizer: Visualizer, config: dict, directory: str):
+    """Creates the pipeline producing the artifacts of the Particles during the \
+    training of the Swarm.
+
+    Args:
+        visualizer: The visualizer object for drawing graphs and charts.
+        config: The loaded configuration of the swarm training.
+        directory: The directory of the artifacts.
+
+    Returns:
+        ArtifactPipeline: The pipeline, None if no artifact is produced.
+    """
+    handlers = []
+    if config["draw_particle_gantt"]:
+        handlers.append(GanttHandler(visualizer, directory))
+    if config.get("write_particle_csv"):
+        handlers.append(CsvHandler(visualizer, directory))
+    if config.get("draw_cost_progress"):
+        handlers.append(
+            CostGraphHandler(visualizer, f"{directory}/swarm_cost_progress.png")
+        )
+    if not handlers:
+        return None
+
+    sampling = SamplingPolicy(
+        config.get("ARTIFACT_EVERY_N_EPOCHS", 1),
+        config.get("ARTIFACT_BEST_ONLY", False),
+    )
+    return ArtifactPipeline(
+        [log_summary] + handlers, sampling, config.get("ARTIFACT_QUEUE_SIZE", 8)
+    )
+
+
+def run_swarm(
+    visualizer: Visualizer,
+    config: dict,
+    workload_cache=None,
+    resume=False,
+    evaluation_cache=None,
+):
     """Runs the training of the Swarm.
     Args:
         visualizer: The visualizer object for drawing graphs and charts.
         config: The loaded configuration of the swarm training.
+        workload_cache: The WorkloadCache shared by the experiments.
+        resume: A flag for continuing the training from its last checkpoint.
+        evaluation_cache: The EvaluationCache shared by the experiments.
     """
     seed = config["SEED"]
+    checkpoint_path = f"{RESULT_DIR}{seed}/checkpoint.pkl"
 
-    def draw_stats(num_epoch, particle_idx, exp_stats):
-        """A method to be injected in the run_epochs to draw the stats within the epoch.
-        Args:
-            num_epoch: The epoch identifier.
-            particle_idx: The particle identifier.
-            exp_stats: The list from which the stats are drawn.
-        """
-        for i, stat in enumerate(exp_stats):
-            visualizer.draw_gantt(
-                stat,
-                f"{RESULT_DIR}{seed}/epoch_{num_epoch}/particule-{particle_idx}-exp-{i}.png",
-            )
-
-        df_stat = pd.DataFrame([stat.to_dict() for stat in exp_stats])
-        logger.debug(f"\n{df_stat}", epoch=num_epoch, particule_idx=particle_idx)
-        logger.debug(
-            f"Mean cost",
-            cost=df_stat["cost"].mean(),
-            epoch=num_epoch,
-            particule_idx=particle_idx + 1,
+    racing = None
+    if config.get("RACING"):
+        racing = RacingConfig(
+            config.get("RACING_MIN_EXPTS", 3), config.get("RACING_ALPHA", 0.01)
         )
 
     swarm = Swarm(
@@ -50,12 +96,29 @@ def run_swarm(visualizer: Visualizer, config: dict):
         num_particles=config["PARTICLE_COUNT"],
         num_srvs=config["SERVER_COUNT"],
         num_exp=config["EXPTS_COUNT"],
+        workload_cache=workload_cache,
+        num_workers=config.get("WORKER_COUNT", 1),
+        racing=racing,
+        evaluation_cache=evaluation_cache,
+        history_dir=config.get("HISTORY_DIR"),
+        instrument=config.get("INSTRUMENT", False),
     )
 
-    stat_handler = draw_stats if config["draw_particle_gantt"] else None
-    epoch_costs = swarm.run_epochs(
-        num_epochs=config["EPOCH_COUNT"], stat_handler=stat_handler
-    )
+    if resume and os.path.exists(checkpoint_path):
+        swarm.load_checkpoint(checkpoint_path)
+    elif resume:
+        logger.warning("No checkpoint found, starting over.", path=checkpoint_path)
+
+    artifacts = make_artifact_pipeline(visualizer, config, f"{RESULT_DIR}{seed}")
+    try:
+        epoch_costs = swarm.run_epochs(
+            num_epochs=config["EPOCH_COUNT"],
+            stat_handler=artifacts,
+            checkpoint_path=checkpoint_path,
+        )
+    finally:
+        if artifacts is not None:
+            artifacts.close()
 
     if config["draw_cost_graph"]:
         df_cost = pd.DataFrame([cost.to_dict() for cost in epoch_costs])
@@ -68,6 +131,67 @@ def run_swarm(visualizer: Visualizer, config: dict):
     visualizer.to_csv(
         [cost.to_dict() for cost in epoch_costs], f"{RESULT_DIR}{seed}/swarm_costs.csv"
     )
+    if swarm.epoch_metrics:
+        write_phase_metrics(
+            swarm.epoch_metrics, f"{RESULT_DIR}{seed}/phase_metrics.json"
+        )
+
+
+def write_phase_metrics(epoch_metrics: dict, filepath: str):
+    """Writes the PhaseMetrics of the epochs of a Swarm and their sum to JSON.
+
+    Args:
+        epoch_metrics: The PhaseMetrics objects of the epochs, by epoch identifier.
+        filepath: The location of the JSON file.
+    """
+    total = sum(epoch_metrics.values(), PhaseMetrics())
+    document = {
+        "epochs": [
+            {"epoch": epoch, **epoch_metrics[epoch].to_dict()}
+            for epoch in sorted(epoch_metrics)
+        ],
+        "total": total.to_dict(),
+    }
+    with open(filepath, "w") as file:
+        json.dump(document, file, indent=1)
+
+
+def run_trace(visualizer: Visualizer, config: dict):
+    """Runs the scheduler on a workload trace of the Parallel Workloads Archive.
+
+    Args:
+        visualizer: The visualizer object writing the CSV file.
+        config: The loaded configuration of the trace.
+    """
+    rules = TraceRules(
+        server_count=config["SERVER_COUNT"],
+        cores_per_server=config.get("CORES_PER_SERVER", 1),
+        alpha=config.get("ALPHA", (0.5, 1)),
+        data=config.get("DATA", 100),
+        data_per_mb=config.get("DATA_PER_MB", 0),
+        max_server_factor=config.get("MAX_SERVER_FACTOR", 2),
+        seed=config.get("SEED", 0),
+    )
+    trace = SwfTrace(config["PATH"], rules, config.get("cache_dir"))
+    directory = f"./results/trace/{trace.path.stem}"
+    # The completed jobs of the viewer are streamed to disk, not kept in memory.
+    keep_history = config.get("VIEWER", False)
+    experiment = Experiments(
+        reconfig_enabled=config.get("reconfig_enabled", True),
+        power_off_enabled=config.get("power_off_enabled", True),
+        param_enabled=config.get("param_enabled", True),
+        keep_history=keep_history,
+        history_dir=f"{directory}/history" if keep_history else None,
+    )
+    stats = experiment.run_workload(
+        SchedulerConfig(), rules.server_count, trace.requests(), rules.seed
+    )
+    logger.info("Trace simulated.", trace=str(trace.path), cost=stats.cost)
+    visualizer.to_csv([stats.to_dict()], f"{directory}/trace_stats.csv")
+    if keep_history:
+        export_schedule(
+            stats.complete_jobs, f"{directory}/viewer.html", rules.server_count
+        )
 
 
 def get_args(args):
@@ -85,6 +209,31 @@ def get_args(args):
         action="store_true",
         help="Initiates the running of six benchmarking experiments.",
     )
+    parser.add_argument(
+        "--run-scaling",
+        action="store_true",
+        help="Initiates the scaling benchmark over server and job counts.",
+    )
+    parser.add_argument(
+        "--run-trace",
+        action="store_true",
+        help="Initiates the simulation of the configured workload trace.",
+    )
+    parser.add_argument(
+        "--run-perf",
+        action="store_true",
+        help="Runs the performance suite and compares it to its previous run.",
+    )
+    parser.add_argument(
+        "--compare-perf",
+        action="store_true",
+        help="Compares the last run of the performance suite to its baseline.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resumes the training of the swarm from its last completed epoch.",
+    )
     args = parser.parse_args(args=args)
     return args
 
@@ -97,13 +246,54 @@ def load_config():
 
 
 def main(args):
+    """Runs the operations selected by the input arguments.
+
+    Returns:
+        int: The exit status, 1 if the performance suite regressed, 0 otherwise.
+    """
     init_logging(__name__)
     args = get_args(args)
-    visualizer = Visualizer()
     config = load_config()
+    visualizer = Visualizer(config.get("rendering", {}).get("WORKER_COUNT", 0))
+    workload_config = config.get("workloads", {})
+    workload_cache = WorkloadCache(
+        workload_config.get("cache_dir"), workload_config.get("cache_size", 64)
+    )
+
+    evaluation_config = config.get("evaluations", {})
+    evaluation_cache = EvaluationCache(
+        evaluation_config.get("cache_path"),
+        evaluation_config.get("cache_size", 100000),
+        evaluation_config.get("precision", 4),
+    )
+
+    try:
+        if vars(args).get("train_swarm"):
+            run_swarm(
+                visualizer,
+                config["swarm"],
+                workload_cache,
+                args.resume,
+                evaluation_cache,
+            )
+
+        if vars(args).get("run_benchmarks"):
+            run_all_experiments(
+                visualizer, config["benchmarks"], workload_cache, evaluation_cache
+            )
+
+        if vars(args).get("run_scaling"):
+            run_scaling_benchmark(visualizer, config["scaling"])
 
-    if vars(args).get("train_swarm"):
-        run_swarm(visualizer, config["swarm"])
+        if vars(args).get("run_trace"):
+            run_trace(visualizer, config["trace"])
 
-    if vars(args).get("run_benchmarks"):
-        run_all_experiments(visualizer, config["benchmarks"])
+        regressions = []
+        if vars(args).get("run_perf"):
+            regressions += run_perf_suite(config["perf"])
+        if vars(args).get("compare_perf"):
+            regressions += compare_perf_history(config["perf"])
+    finally:
+        # The Gantt charts still rendered in the background are waited for.
+        visualizer.close()
+    return 1 if regressions else 0
@@ -4,4 +4,4 @@ import sys
 import scheduling
 
 if __name__ == "__main__":
-    scheduling.main(args=sys.argv[1:])
+    sys.exit(scheduling.main(args=sys.argv[1:]))
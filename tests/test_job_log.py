@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from scheduling.Experiments import Experiments
+from scheduling.JobHistory import JobHistory
+from scheduling.JobLog import JobLog
+from scheduling.Scheduler import Scheduler, SchedulerConfig
+from scheduling.Simulation import Simulation
+from scheduling.Workload import Workload
+
+SERVER_COUNT = 10
+JOB_COUNT = 200
+SEED = 1
+BATCH_SIZE = 7
+
+
+def run_scheduler(job_sink):
+    # Without the decision process, the jobs are reconfigured whenever possible.
+    scheduler = Scheduler(
+        SERVER_COUNT,
+        SchedulerConfig(),
+        param_enabled=False,
+        seed_num=SEED,
+        job_sink=job_sink,
+    )
+    simulation = Simulation(scheduler, time_step=Experiments.TIME_STEP)
+    workload = Workload.generate(JOB_COUNT, SERVER_COUNT, SEED)
+    scheduler.stop(simulation.run(workload.requests()))
+    return scheduler
+
+
+def records(history):
+    return [
+        (job.id, job.kind, job.start_time, job.end_time, list(job.servers))
+        for job in history
+    ]
+
+
+def test_log_reads_back_as_the_history(tmp_path):
+    history = run_scheduler(JobHistory()).complete_jobs
+    log = run_scheduler(JobLog(tmp_path, BATCH_SIZE)).complete_jobs
+    assert set(history.kinds) == set(JobHistory.Kind)
+    # The scheduler flushed the last batch when it stopped.
+    assert len(log) == log.count == len(history)
+
+    mapped = log.read()
+    assert records(mapped) == records(history)
+    assert mapped.ids == history.ids
+    expected_columns = history.columns()
+    for name, column in mapped.columns().items():
+        assert np.array_equal(column, expected_columns[name]), name
+    for runs, expected_runs in zip(mapped.server_runs(), history.server_runs()):
+        assert np.array_equal(runs, expected_runs)
+    with pytest.raises(TypeError):
+        mapped.append(None)
+
+
+def test_log_truncates_its_directory(tmp_path):
+    run_scheduler(JobLog(tmp_path, BATCH_SIZE))
+    log = JobLog(tmp_path, BATCH_SIZE)
+    mapped = log.read()
+    assert len(mapped) == 0 and mapped.ids == []
+    assert list(mapped.server_offsets) == [0]
@@ -0,0 +1,41 @@
+from random import Random
+
+from scheduling.Job import Job
+from scheduling.JobRegistry import JobRegistry
+
+JOB_COUNT = 500
+
+
+def test_compaction_keeps_the_complete_jobs():
+    rng = Random(1)
+    registry = JobRegistry()
+    jobs = [
+        Job.make_power_off([], start_time=0, duration=rng.randrange(1000))
+        for _ in range(JOB_COUNT)
+    ]
+    for job in jobs:
+        registry.add(job)
+
+    # Removals and interruptions leave stale heap entries behind, until they
+    # outnumber the active jobs and the heap is compacted.
+    removed = rng.sample(jobs, 450)
+    for job in removed[:400]:
+        registry.remove(job)
+    for job in removed[400:]:
+        registry.remove(job)
+        job.end_time = rng.randrange(1000)
+        registry.add(job)
+    assert len(registry._heap) < JOB_COUNT, "The heap must have been compacted"
+    assert len(registry._heap) <= 2 * len(registry) + 64
+    assert len(registry) == registry.power_off_count == JOB_COUNT - 400
+
+    active = [job for job in jobs if job in registry]
+    expected = sorted(active, key=lambda job: job.end_time)
+    complete_jobs = []
+    for time in range(0, 1000, 100):
+        complete_jobs += registry.pop_complete(time)
+    complete_jobs += registry.pop_complete(1000)
+    assert [job.end_time for job in complete_jobs] == [
+        job.end_time for job in expected
+    ]
+    assert set(complete_jobs) == set(active)
@@ -0,0 +1,36 @@
+from random import Random
+
+from scheduling.JobRequest import JobRequest
+from scheduling.RequestQueue import RequestQueue
+
+
+def make_request(i, sub_time):
+    return JobRequest(f"job{i}", sub_time, 1, 100, 100, i % 3 + 1, 4)
+
+
+def test_late_requests_keep_the_fifo_order():
+    # Mostly chronological submissions, with late ones and ties.
+    rng = Random(1)
+    queue = RequestQueue()
+    expected = []
+    sub_time = 0
+    for i in range(300):
+        sub_time += rng.choice([0, 0, 5])
+        request = make_request(i, sub_time - (rng.randrange(0, 30, 5) if i % 4 else 0))
+        queue.push(request)
+        expected.append((request.sub_time, i, request))
+        expected.sort(key=lambda entry: entry[:2])
+        assert list(queue) == [request for _, _, request in expected]
+
+        if rng.random() < 0.6:
+            assert queue.peek() is expected[0][-1]
+            assert queue.pop() is expected.pop(0)[-1]
+        assert len(queue) == len(expected)
+        assert queue.required_servers == sum(
+            request.min_num_servers for _, _, request in expected
+        )
+
+    assert queue._late, "The late requests must go through the heap"
+    while expected:
+        assert queue.pop() is expected.pop(0)[-1]
+    assert not queue and queue.required_servers == 0
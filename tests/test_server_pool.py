@@ -0,0 +1,36 @@
+from random import Random
+
+from scheduling.Server import Server, ServerPool
+
+SERVER_COUNT = 20
+
+
+def test_blocks_and_single_servers_mix():
+    servers = [Server(i) for i in range(SERVER_COUNT)]
+    pool = ServerPool(servers)
+    expected = set(servers)
+    rng = Random(1)
+    for _ in range(200):
+        outside = [server for server in servers if server not in expected]
+        action = rng.randrange(4)
+        if action == 0 and expected:
+            taken = pool.take(rng.randint(0, len(pool)))
+            assert len(set(taken)) == len(taken)
+            expected.difference_update(taken)
+        elif action == 1 and outside:
+            block = rng.sample(outside, rng.randint(1, len(outside)))
+            pool.extend(block)
+            expected.update(block)
+        elif action == 2 and expected:
+            server = rng.choice(sorted(expected, key=lambda server: server.index))
+            pool.remove(server)
+            expected.remove(server)
+        elif action == 3 and outside:
+            server = rng.choice(outside)
+            pool.add(server)
+            pool.add(server)
+            expected.add(server)
+
+        assert len(pool) == len(expected)
+        assert set(pool) == expected
+        assert all((server in pool) == (server in expected) for server in servers)
@@ -0,0 +1,64 @@
+import pytest
+
+from scheduling.Experiments import Experiments
+from scheduling.Scheduler import Scheduler, SchedulerConfig
+from scheduling.Simulation import Simulation
+from scheduling.Workload import Workload
+
+SERVER_COUNT = 10
+JOB_COUNT = 50
+SEEDS = [1, 2, 3]
+FLAGS = [
+    dict(reconfig_enabled=False, power_off_enabled=False, param_enabled=False),
+    dict(reconfig_enabled=True, power_off_enabled=False, param_enabled=False),
+    dict(reconfig_enabled=False, power_off_enabled=True, param_enabled=False),
+    dict(reconfig_enabled=True, power_off_enabled=True, param_enabled=True),
+]
+
+
+def run_tick_loop(scheduler, job_requests, time_step):
+    """Updates a scheduler every time_step seconds until it has run every job.
+
+    It is the loop the experiments were run with before the discrete-event
+    Simulation, which is expected to give the same schedules.
+
+    Args:
+        scheduler: The Scheduler to be run.
+        job_requests: The JobRequests ordered by submission time.
+        time_step: The period of the updates of the schedule.
+
+    Returns:
+        The instant at which the scheduler can be stopped.
+    """
+    pending = list(job_requests)
+    time = 0
+    while pending or scheduler.is_working():
+        while pending and pending[0].sub_time <= time:
+            scheduler.schedule(pending.pop(0))
+        scheduler.update_schedule(time)
+        time += time_step
+    return time
+
+
+def make_scheduler(flags, seed_num):
+    return Scheduler(
+        SERVER_COUNT, SchedulerConfig(), **flags, keep_history=False, seed_num=seed_num
+    )
+
+
+@pytest.mark.parametrize("flags", FLAGS)
+@pytest.mark.parametrize("seed_num", SEEDS)
+def test_simulation_matches_tick_loop(flags, seed_num):
+    workload = Workload.generate(JOB_COUNT, SERVER_COUNT, seed_num)
+
+    reference = make_scheduler(flags, seed_num)
+    end_time = run_tick_loop(reference, workload.requests(), Experiments.TIME_STEP)
+    reference.stop(end_time)
+
+    scheduler = make_scheduler(flags, seed_num)
+    simulation = Simulation(scheduler, time_step=Experiments.TIME_STEP)
+    scheduler.stop(simulation.run(workload.requests()))
+
+    expected = reference.stats(stretch_time_weight=1, energy_weight=1)
+    stats = scheduler.stats(stretch_time_weight=1, energy_weight=1)
+    assert stats.to_dict() == expected.to_dict()
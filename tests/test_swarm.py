@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from scheduling.Racing import RacingConfig
+from scheduling.Swarm import Swarm
+
+SEED = 1
+PARTICLE_COUNT = 4
+SERVER_COUNT = 5
+EXPTS_COUNT = 3
+EPOCH_COUNT = 4
+
+
+def make_swarm(racing=None, instrument=False):
+    return Swarm(
+        SEED,
+        PARTICLE_COUNT,
+        SERVER_COUNT,
+        num_exp=EXPTS_COUNT,
+        racing=racing,
+        instrument=instrument,
+    )
+
+
+@pytest.mark.parametrize("racing", [None, RacingConfig()])
+def test_resume_matches_uninterrupted_run(tmp_path, racing):
+    checkpoint_path = tmp_path / "swarm.pkl"
+    make_swarm(racing).run_epochs(EPOCH_COUNT // 2, None, checkpoint_path)
+    resumed = make_swarm(racing)
+    resumed.load_checkpoint(checkpoint_path)
+    resumed_costs = resumed.run_epochs(EPOCH_COUNT, None, checkpoint_path)
+
+    uninterrupted = make_swarm(racing)
+    costs = uninterrupted.run_epochs(EPOCH_COUNT, None)
+
+    assert [cost.to_dict() for cost in resumed_costs] == [
+        cost.to_dict() for cost in costs
+    ]
+    assert (
+        resumed.best_particle.config.to_dict()
+        == uninterrupted.best_particle.config.to_dict()
+    )
+    for name in ("positions", "velocities", "best_positions", "best_costs"):
+        assert np.array_equal(
+            getattr(resumed.population, name), getattr(uninterrupted.population, name)
+        )
+
+
+def test_resume_keeps_phase_metrics(tmp_path):
+    checkpoint_path = tmp_path / "swarm.pkl"
+    make_swarm(instrument=True).run_epochs(EPOCH_COUNT // 2, None, checkpoint_path)
+    resumed = make_swarm(instrument=True)
+    resumed.load_checkpoint(checkpoint_path)
+    resumed.run_epochs(EPOCH_COUNT, None, checkpoint_path)
+
+    uninterrupted = make_swarm(instrument=True)
+    uninterrupted.run_epochs(EPOCH_COUNT, None)
+
+    assert sorted(resumed.epoch_metrics) == list(range(EPOCH_COUNT))
+    for epoch, metrics in uninterrupted.epoch_metrics.items():
+        # The counters are deterministic, unlike the timers.
+        assert resumed.epoch_metrics[epoch].jobs_started == metrics.jobs_started
+        assert resumed.epoch_metrics[epoch].update_count == metrics.update_count
@@ -0,0 +1,75 @@
+import gzip
+
+import pytest
+
+from scheduling.SwfTrace import SwfTrace, TraceRules
+
+# job, submit, wait, run, allocated, cpu, memory, requested, then unused fields.
+RECORDS = [
+    "1 0 5 100 4 -1 1024 4 -1 -1 1 -1 -1 -1 -1 -1 -1 -1",
+    # No requested processors: the allocated ones are used.
+    "2 10 5 50 6 -1 -1 -1 -1 -1 1 -1 -1 -1 -1 -1 -1 -1",
+    # No allocated processors: the requested ones are used.
+    "3 20 5 30 -1 -1 -1 3 -1 -1 1 -1 -1 -1 -1 -1 -1 -1",
+    # No run time, a cancelled job: skipped.
+    "4 30 5 -1 2 -1 -1 2 -1 -1 5 -1 -1 -1 -1 -1 -1 -1",
+    # No processors at all: skipped.
+    "5 40 5 10 -1 -1 -1 -1 -1 -1 1 -1 -1 -1 -1 -1 -1 -1",
+    # More processors than the cluster: clipped to the server count.
+    "6 50 5 10 40 -1 -1 40 -1 -1 1 -1 -1 -1 -1 -1 -1 -1",
+]
+RULES = TraceRules(
+    server_count=8, cores_per_server=2, alpha=1, data=100, data_per_mb=0.5
+)
+EXPECTED = [
+    # id, sub_time, data, mass, min_num_servers, max_num_servers
+    ("job0", 0, 2, 200, 2, 4),
+    ("job1", 10, 100, 150, 3, 6),
+    ("job2", 20, 100, 60, 2, 4),
+    ("job3", 50, 100, 80, 8, 8),
+]
+
+
+def write_trace(path, records, opener=open):
+    with opener(path, "wt") as file:
+        file.write("; Version: 2.2\n; MaxProcs: 16\n")
+        file.write("\n".join(records) + "\n")
+    return path
+
+
+def summarize(requests):
+    return [
+        (
+            request.id,
+            request.sub_time,
+            request.data,
+            request.mass,
+            request.min_num_servers,
+            request.max_num_servers,
+        )
+        for request in requests
+    ]
+
+
+def test_records_are_converted(tmp_path):
+    trace = SwfTrace(write_trace(tmp_path / "trace.swf", RECORDS), RULES)
+    requests = list(trace.requests())
+    assert summarize(requests) == EXPECTED
+    assert all(request.alpha == 1 for request in requests)
+
+
+def test_compressed_and_cached_traces_match(tmp_path):
+    path = write_trace(tmp_path / "trace.swf.gz", RECORDS, gzip.open)
+    cache_dir = tmp_path / "cache"
+    assert summarize(SwfTrace(path, RULES).requests()) == EXPECTED
+    # Converted then loaded back from the cache.
+    for _ in range(2):
+        trace = SwfTrace(path, RULES, cache_dir)
+        assert summarize(trace.requests()) == EXPECTED
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_unordered_records_are_rejected(tmp_path):
+    path = write_trace(tmp_path / "trace.swf", [RECORDS[1], RECORDS[0]])
+    with pytest.raises(ValueError):
+        list(SwfTrace(path, RULES).requests())
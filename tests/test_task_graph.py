@@ -0,0 +1,67 @@
+import os
+
+from scheduling.Executor import make_executor
+from scheduling.TaskGraph import TaskGraph
+
+
+def make_graph(directory, calls):
+    # load -> simulate (stats from config) -> plot (chart from stats)
+    config, stats, chart = (directory / name for name in ("config", "stats", "chart"))
+
+    def load():
+        calls.append("load")
+        return "workload"
+
+    def simulate(workload):
+        calls.append("simulate")
+        stats.write_text(workload)
+        return "stats"
+
+    def plot(result):
+        calls.append("plot")
+        chart.write_text(result)
+
+    graph = TaskGraph()
+    graph.add("load", load)
+    graph.add("simulate", simulate, deps=["load"], outputs=[stats], inputs=[config])
+    graph.add("plot", plot, deps=["simulate"], outputs=[chart], inputs=[stats])
+    return graph
+
+
+def set_mtimes(*paths):
+    # Explicit modification times, the file system may not tell writes apart.
+    for mtime, path in enumerate(paths, 1000):
+        os.utime(path, (mtime, mtime))
+
+
+def run(directory):
+    calls = []
+    with make_executor("thread", 2) as executor:
+        make_graph(directory, calls).run(executor)
+    return calls
+
+
+def test_up_to_date_tasks_are_skipped(tmp_path):
+    config, stats, chart = (tmp_path / name for name in ("config", "stats", "chart"))
+    config.write_text("")
+    assert run(tmp_path) == ["load", "simulate", "plot"]
+
+    set_mtimes(config, stats, chart)
+    # The dependency of the skipped tasks is skipped too.
+    assert run(tmp_path) == []
+
+    # A touched input reruns the task producing from it and its dependencies.
+    set_mtimes(stats, chart, config)
+    assert run(tmp_path) == ["load", "simulate"]
+    # Its outputs are now newer than the ones of the next task.
+    set_mtimes(config, chart, stats)
+    assert run(tmp_path) == ["load", "simulate", "plot"]
+
+
+def test_missing_output_reruns_its_task(tmp_path):
+    config, stats, chart = (tmp_path / name for name in ("config", "stats", "chart"))
+    config.write_text("")
+    run(tmp_path)
+    set_mtimes(config, stats, chart)
+    chart.unlink()
+    assert run(tmp_path) == ["load", "simulate", "plot"]
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from scheduling.Workload import Workload
+from scheduling.WorkloadCache import WorkloadCache
+
+JOB_COUNT = 2000
+SERVER_COUNT = 50
+SEED = 1
+THREAD_COUNT = 6
+
+
+def test_concurrent_threads_share_a_key(tmp_path):
+    expected = Workload.generate(JOB_COUNT, SERVER_COUNT, SEED).jobs
+    for trial in range(10):
+        cache = WorkloadCache(tmp_path / str(trial))
+        with ThreadPoolExecutor(THREAD_COUNT) as pool:
+            futures = [
+                pool.submit(cache.get, JOB_COUNT, SERVER_COUNT, SEED)
+                for _ in range(THREAD_COUNT)
+            ]
+            workloads = [future.result() for future in futures]
+        for workload in workloads:
+            assert np.array_equal(workload.jobs, expected)
+        # Only the renamed workload is left in the directory.
+        assert [path.name for path in (tmp_path / str(trial)).iterdir()] == [
+            f"{cache.key(JOB_COUNT, SERVER_COUNT, SEED)}.npy"
+        ]
+
+
+def test_workload_is_loaded_from_disk(tmp_path):
+    first = WorkloadCache(tmp_path).get(JOB_COUNT, SERVER_COUNT, SEED)
+    cache = WorkloadCache(tmp_path)
+    workload = cache.get(JOB_COUNT, SERVER_COUNT, SEED)
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert isinstance(workload.jobs, np.memmap)
+    assert np.array_equal(workload.jobs, first.jobs)